@@ -0,0 +1,39 @@
+"""Add (session_id, created_at) covering index to dialogue_logs
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2024-12-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the session history index without locking writes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_dialogue_logs_session_created',
+            'dialogue_logs',
+            ['session_id', 'created_at'],
+            postgresql_include=['player_message', 'npc_response'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the session history index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_dialogue_logs_session_created',
+            table_name='dialogue_logs',
+            postgresql_concurrently=True,
+        )
@@ -106,7 +106,7 @@ async def polish_clue_stream(
 
     async def generate() -> AsyncGenerator[str, None]:
         try:
-            async for chunk in service.polish_clue_detail_stream(
+            async for chunk in service.polish_clue_detail_iter(
                 clue_name=request.clue_name,
                 clue_detail=request.clue_detail,
                 context=request.context,
@@ -181,7 +181,7 @@ async def generate_semantic_summary_stream(
 
     async def generate() -> AsyncGenerator[str, None]:
         try:
-            async for chunk in service.generate_semantic_summary_stream(
+            async for chunk in service.generate_semantic_summary_iter(
                 clue_name=request.clue_name,
                 clue_detail=request.clue_detail,
                 llm_config_id=request.llm_config_id,
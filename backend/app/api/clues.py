@@ -267,7 +267,7 @@ async def get_clue_tree(
 
     # Validate tree and get issues
     tree_service = ClueTreeService(db)
-    validation = await tree_service.validate_clue_tree(script_id)
+    validation = await tree_service.validate_clue_tree(script_id, detailed=True)
     issues = ClueTreeIssues(
         dead_clues=validation.dead_clues,
         orphan_clues=validation.orphan_clues,
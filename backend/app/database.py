@@ -4,25 +4,38 @@ from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import event, text
+from sqlalchemy import event, make_url, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
 
+_database_url = make_url(settings.database_url)
+
+# asyncpg sends server_settings in the connection startup packet, so the
+# search_path costs no extra round trip per new pooled connection.
+_use_server_settings = bool(settings.database_schema) and (
+    _database_url.get_driver_name() == "asyncpg"
+)
+
 # Create async engine with standard connection pooling
 engine = create_async_engine(
-    settings.database_url,
+    _database_url,
     echo=settings.database_echo,
     future=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    connect_args=(
+        {"server_settings": {"search_path": settings.database_schema}}
+        if _use_server_settings
+        else {}
+    ),
 )
 
 
-# Set search_path when schema is configured
-if settings.database_schema:
+# Set search_path when schema is configured (for drivers other than asyncpg)
+if settings.database_schema and not _use_server_settings:
     @event.listens_for(engine.sync_engine, "connect")
     def set_search_path(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
@@ -15,6 +15,7 @@ from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.api import api_router
 from app.config import settings
 from app.middleware import RequestIDMiddleware
+from app.services.common import LLMClient
 
 # Frontend static files directory
 STATIC_DIR = Path(__file__).parent.parent / "static"
@@ -46,6 +47,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     logger.info("Shutting down application")
+    await LLMClient.close()
 
 
 def create_app() -> FastAPI:
@@ -30,7 +30,8 @@ class LLMConfig(Base):
 
     Type-specific options (stored in JSON):
     - For embedding: similarity_threshold, dimensions
-    - For chat: temperature, max_tokens, top_p, etc.
+    - For chat: temperature, max_tokens, top_p, supports_json_mode,
+      semantic_cache_threshold, response_cache_ttl, etc.
     """
 
     __tablename__ = "llm_configs"
@@ -102,5 +103,24 @@ class LLMConfig(Base):
         index=True,
     )
 
+    @property
+    def supports_json_mode(self) -> bool:
+        """Whether the provider accepts OpenAI-style ``response_format`` JSON mode."""
+        return bool((self.options or {}).get("supports_json_mode", False))
+
+    @property
+    def semantic_cache_threshold(self) -> float | None:
+        """Similarity above which cached enhancement responses are reused.
+
+        ``None`` (the default) disables the semantic response cache.
+        """
+        threshold = (self.options or {}).get("semantic_cache_threshold")
+        return float(threshold) if threshold is not None else None
+
+    @property
+    def response_cache_ttl(self) -> float:
+        """Seconds identical enhancement prompts reuse a cached response (0 = off)."""
+        return float((self.options or {}).get("response_cache_ttl", 0))
+
     def __repr__(self) -> str:
         return f"<LLMConfig(id={self.id}, name={self.name}, type={self.type})>"
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,6 +20,16 @@ class DialogueLog(Base):
     """
 
     __tablename__ = "dialogue_logs"
+    __table_args__ = (
+        # Serves the "latest N turns of a session" query for NPC replies
+        # with an index-only scan on PostgreSQL.
+        Index(
+            "ix_dialogue_logs_session_created",
+            "session_id",
+            "created_at",
+            postgresql_include=["player_message", "npc_response"],
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(20),
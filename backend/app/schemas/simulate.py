@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 class VectorBackendOverride(str, Enum):
     """Vector backend options."""
 
+    NUMPY = "numpy"
     CHROMA = "chroma"
 
 
@@ -23,7 +24,7 @@ class EmbeddingOptionsOverride(BaseModel):
     )
     vector_backend: VectorBackendOverride | None = Field(
         default=None,
-        description="Override vector backend (only chroma supported)",
+        description="Override vector backend (numpy or chroma)",
     )
 
 
@@ -13,6 +13,7 @@ from app.schemas.clue import (
     ClueTreeResponse,
     ClueTreeValidation,
 )
+from app.services import graph_algo
 
 
 @dataclass
@@ -72,26 +73,32 @@ class ClueTreeService:
         """
         graph = await self._build_graph(script_id)
 
-        nodes = []
-        for clue_id, clue in graph.nodes.items():
-            node = ClueTreeNode(
+        # Clues come from validated ORM rows, so skip Pydantic validation
+        nodes = [
+            ClueTreeNode.model_construct(
                 id=clue.id,
                 name=clue.name,
                 type=clue.type.value,
                 npc_id=clue.npc_id,
                 prereq_clue_ids=clue.prereq_clue_ids or [],
             )
-            nodes.append(node)
+            for clue in graph.nodes.values()
+        ]
 
+        # prereq_clue_ids may reference missing clues; only include edges
+        # where both nodes exist
+        valid = graph.nodes.keys()
         edges = [
-            ClueTreeEdge(source=edge.source, target=edge.target)
+            ClueTreeEdge.model_construct(source=edge.source, target=edge.target)
             for edge in graph.edges
-            if edge.source in graph.nodes  # Only include edges where both nodes exist
+            if edge.source in valid
         ]
 
         return ClueTreeResponse(nodes=nodes, edges=edges)
 
-    async def validate_clue_tree(self, script_id: str) -> ClueTreeValidation:
+    async def validate_clue_tree(
+        self, script_id: str, detailed: bool = False
+    ) -> ClueTreeValidation:
         """
         Validate the clue tree for a script.
 
@@ -100,8 +107,12 @@ class ClueTreeService:
         - Dead clues (unreachable from any starting point)
         - Orphan clues (no prerequisites and not referenced by others)
 
+        When cycles are found the tree is already invalid, so dead-clue
+        analysis is skipped unless ``detailed`` is set.
+
         Args:
             script_id: The script ID to validate.
+            detailed: Always run dead-clue analysis, even if cycles exist.
 
         Returns:
             ClueTreeValidation with validation results.
@@ -109,18 +120,26 @@ class ClueTreeService:
         graph = await self._build_graph(script_id)
 
         # Detect cycles using DFS
-        cycles = self._detect_cycles(graph)
+        cycles = graph_algo.detect_cycles(graph.nodes, graph.adjacency)
 
         # Find root clues (no prerequisites)
-        root_clues = self._find_root_clues(graph)
+        root_clues = graph_algo.find_roots(graph.nodes, graph.reverse_adjacency)
 
         # Find dead clues (unreachable from roots)
-        dead_clues = self._find_dead_clues(graph, root_clues)
+        warnings = []
+        if cycles and not detailed:
+            dead_clues: list[str] = []
+            warnings.append("Cycles present; dead-clue analysis skipped")
+        else:
+            dead_clues = graph_algo.find_dead(
+                graph.nodes, graph.adjacency, root_clues
+            )
 
         # Find orphan clues (no relations at all)
-        orphan_clues = self._find_orphan_clues(graph)
+        orphan_clues = graph_algo.find_orphans(
+            graph.nodes, graph.adjacency, graph.reverse_adjacency
+        )
 
-        warnings = []
         if not root_clues:
             warnings.append("No root clues found (all clues have prerequisites)")
         if len(root_clues) > 10:
@@ -153,92 +172,3 @@ class ClueTreeService:
             graph.add_node(clue)
 
         return graph
-
-    def _detect_cycles(self, graph: ClueGraph) -> list[list[str]]:
-        """
-        Detect cycles in the graph using DFS.
-
-        Returns a list of cycles, where each cycle is a list of clue IDs.
-        """
-        cycles: list[list[str]] = []
-        visited: set[str] = set()
-        rec_stack: set[str] = set()
-        path: list[str] = []
-
-        def dfs(node: str) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            for neighbor in graph.adjacency.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor)
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:] + [neighbor]
-                    cycles.append(cycle)
-
-            path.pop()
-            rec_stack.remove(node)
-
-        for node in graph.nodes:
-            if node not in visited:
-                dfs(node)
-
-        return cycles
-
-    def _find_root_clues(self, graph: ClueGraph) -> set[str]:
-        """Find clues with no prerequisites (root nodes)."""
-        roots = set()
-        for clue_id in graph.nodes:
-            if not graph.reverse_adjacency.get(clue_id):
-                roots.add(clue_id)
-        return roots
-
-    def _find_dead_clues(self, graph: ClueGraph, root_clues: set[str]) -> list[str]:
-        """
-        Find clues that are unreachable from any root clue.
-
-        A dead clue has prerequisites but those prerequisites form an
-        unreachable subgraph.
-        """
-        if not root_clues:
-            # If no roots, all non-orphan clues are potentially dead
-            return [
-                clue_id
-                for clue_id in graph.nodes
-                if graph.reverse_adjacency.get(clue_id)
-            ]
-
-        # BFS from all root clues
-        reachable: set[str] = set()
-        queue = list(root_clues)
-
-        while queue:
-            current = queue.pop(0)
-            if current in reachable:
-                continue
-            reachable.add(current)
-
-            for neighbor in graph.adjacency.get(current, []):
-                if neighbor not in reachable:
-                    queue.append(neighbor)
-
-        # Dead clues are non-root clues that are not reachable
-        dead = []
-        for clue_id in graph.nodes:
-            if clue_id not in root_clues and clue_id not in reachable:
-                dead.append(clue_id)
-
-        return dead
-
-    def _find_orphan_clues(self, graph: ClueGraph) -> list[str]:
-        """Find clues with no relations (neither prerequisites nor dependents)."""
-        orphans = []
-        for clue_id in graph.nodes:
-            has_prerequisites = bool(graph.reverse_adjacency.get(clue_id))
-            has_dependents = bool(graph.adjacency.get(clue_id))
-            if not has_prerequisites and not has_dependents:
-                orphans.append(clue_id)
-        return orphans
@@ -1,20 +1,133 @@
 """Unified LLM client with connection pooling and multiple response modes."""
 
-import json
+import asyncio
+import importlib.util
 import logging
+import re
 import time
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping, Sequence
+from contextlib import aclosing, suppress
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, TypeVar
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from app.config import settings
 from app.models.llm_config import LLMConfig
 
 logger = logging.getLogger(__name__)
 
+# Matches the first markdown code fence (optionally tagged ``json``) in a response
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# Connection limits for every LLM client; idle connections are kept as long as
+# typical upstreams do (nginx defaults to 75s) so bursts reuse the TLS session
+_POOL_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=75.0
+)
+
+# HTTP/2 multiplexing needs the optional ``h2`` package (httpx[http2])
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Maximum time (seconds) streamed content is held back when batching deltas
+_STREAM_FLUSH_INTERVAL = 0.02
+
+# Number of streamed items read ahead of a slow consumer
+_STREAM_PREFETCH = 32
+
+# Server-sent event framing
+_DATA_PREFIX = b"data: "
+_DONE = b"[DONE]"
+
+# Reusable SSE line buffers shared by concurrent streams
+_BUF_POOL: deque[bytearray] = deque(maxlen=64)
+
+T = TypeVar("T")
+
+
+def _acquire_buf() -> bytearray:
+    """Take an SSE line buffer from the pool, or create one."""
+    return _BUF_POOL.pop() if _BUF_POOL else bytearray()
+
+
+def _release_buf(buf: bytearray) -> None:
+    """Return an SSE line buffer to the pool."""
+    buf.clear()
+    _BUF_POOL.append(buf)
+
+
+async def _iter_sse_data(response: httpx.Response) -> AsyncGenerator[bytearray, None]:
+    """Yield raw ``data:`` payloads from a server-sent event stream.
+
+    Frames lines on the raw byte stream instead of decoding every line to
+    ``str``; payload decoding is left to the JSON parser. Stops at ``[DONE]``.
+    Only the payload of each ``data:`` line is copied out of the buffer. A
+    final line without a trailing newline is still yielded.
+    """
+    buf = _acquire_buf()
+    try:
+        async for chunk in response.aiter_bytes(65536):
+            buf += chunk
+            start = 0
+            while (i := buf.find(b"\n", start)) != -1:
+                end = i - 1 if i > start and buf[i - 1] == 0x0D else i
+                line_start, start = start, i + 1
+                if not buf.startswith(_DATA_PREFIX, line_start, end):
+                    continue
+                payload = buf[line_start + len(_DATA_PREFIX) : end]
+                if payload == _DONE:
+                    return
+                yield payload
+            del buf[:start]
+        # Some servers close the stream without ending the last line
+        end = len(buf) - 1 if buf.endswith(b"\r") else len(buf)
+        if buf.startswith(_DATA_PREFIX, 0, end):
+            payload = buf[len(_DATA_PREFIX) : end]
+            if payload != _DONE:
+                yield payload
+    finally:
+        _release_buf(buf)
+
+
+async def _prefetch(
+    source: AsyncIterator[T], maxsize: int = _STREAM_PREFETCH
+) -> AsyncGenerator[T, None]:
+    """Drain ``source`` in a background task, buffering up to ``maxsize`` items.
+
+    Lets the network reader keep going while the consumer handles earlier
+    items. Errors from ``source`` are re-raised to the consumer, and closing
+    the consumer early cancels the reader.
+    """
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(maxsize)
+
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await queue.put((False, item))
+        except Exception as exc:
+            await queue.put((True, exc))
+        else:
+            await queue.put((True, None))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            finished, value = await queue.get()
+            if finished:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        if not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
 
 @dataclass
 class LLMUsage:
@@ -68,70 +181,90 @@ class LLMClient:
     - Streaming responses (call_stream)
     - JSON responses (call_json)
     - Structured JSON schema responses (call_structured)
+    - Batched embeddings (call_embeddings)
 
     Uses connection pooling for better performance.
     """
 
     _client: httpx.AsyncClient | None = None
-    _stream_client: httpx.AsyncClient | None = None
+    # (base_url, api_key) -> (chat completions URL, request headers). Small
+    # and short-lived, so replaced credentials do not stay in memory.
+    _endpoint_cache: TTLCache[tuple[str, str], tuple[str, Mapping[str, str]]] = (
+        TTLCache(maxsize=32, ttl=600)
+    )
 
     @classmethod
-    async def get_client(cls, timeout: float | None = None) -> httpx.AsyncClient:
+    def _endpoint(cls, config: LLMConfig) -> tuple[str, Mapping[str, str]]:
+        """Get the chat completions URL and request headers for a config.
+
+        Computed once per (base_url, api_key) pair and reused for up to ten
+        minutes. Keying on the credentials rather than ``config.id`` means an
+        edited URL or rotated key is picked up without explicit invalidation,
+        and the old entry ages out. The headers are read-only since they are
+        shared between requests.
+        """
+        key = (config.base_url, config.api_key)
+        endpoint = cls._endpoint_cache.get(key)
+        if endpoint is None:
+            endpoint = (
+                f"{config.base_url}/chat/completions",
+                MappingProxyType(
+                    {
+                        "Authorization": f"Bearer {config.api_key}",
+                        "Content-Type": "application/json",
+                    }
+                ),
+            )
+            cls._endpoint_cache[key] = endpoint
+        return endpoint
+
+    @classmethod
+    def _build_request(
+        cls,
+        client: httpx.AsyncClient,
+        config: LLMConfig,
+        body: dict[str, Any],
+        timeout: float | None = None,
+    ) -> httpx.Request:
+        """Build a chat completions request with a pre-serialized JSON body.
+
+        Uses the memoized endpoint URL and headers for the config and encodes
+        the body once with orjson.
+        """
+        url, headers = cls._endpoint(config)
+        return client.build_request(
+            "POST",
+            url,
+            headers=headers,
+            content=orjson.dumps(body),
+            timeout=timeout or httpx.USE_CLIENT_DEFAULT,
+        )
+
+    @classmethod
+    async def get_client(cls) -> httpx.AsyncClient:
         """Get or create the shared HTTP client.
 
-        Args:
-            timeout: Optional timeout override
+        Per-call timeouts are passed on each request, so one pooled client
+        (and one set of keep-alive connections per provider) serves every
+        caller: short, long-running and streaming calls alike.
 
         Returns:
             Shared AsyncClient instance
         """
         if cls._client is None:
             cls._client = httpx.AsyncClient(
-                timeout=timeout or settings.llm_timeout,
-                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                timeout=settings.llm_timeout,
+                limits=_POOL_LIMITS,
+                http2=_HTTP2,
             )
         return cls._client
 
-    @classmethod
-    async def get_stream_client(cls) -> httpx.AsyncClient:
-        """Get or create the shared streaming HTTP client.
-
-        Returns:
-            Shared AsyncClient instance for streaming
-        """
-        if cls._stream_client is None:
-            cls._stream_client = httpx.AsyncClient(
-                timeout=settings.llm_stream_timeout,
-                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
-            )
-        return cls._stream_client
-
     @classmethod
     async def close(cls) -> None:
-        """Close all HTTP clients. Call during application shutdown."""
+        """Close the shared HTTP client. Call during application shutdown."""
         if cls._client:
             await cls._client.aclose()
             cls._client = None
-        if cls._stream_client:
-            await cls._stream_client.aclose()
-            cls._stream_client = None
-
-    @classmethod
-    @asynccontextmanager
-    async def managed_client(cls, timeout: float | None = None):
-        """Context manager for temporary client usage.
-
-        Use this when you need a client with custom timeout that
-        shouldn't affect the shared client.
-        """
-        client = httpx.AsyncClient(
-            timeout=timeout or settings.llm_timeout,
-            limits=httpx.Limits(max_connections=5),
-        )
-        try:
-            yield client
-        finally:
-            await client.aclose()
 
     @classmethod
     async def call_text(
@@ -154,11 +287,11 @@ class LLMClient:
         Returns:
             Text content from LLM response
         """
-        client = await cls.get_client(timeout)
-        response = await client.post(
-            f"{config.base_url}/chat/completions",
-            headers={"Authorization": f"Bearer {config.api_key}"},
-            json={
+        client = await cls.get_client()
+        request = cls._build_request(
+            client,
+            config,
+            {
                 "model": config.model,
                 "messages": [
                     {"role": "system", "content": system_prompt},
@@ -166,11 +299,56 @@ class LLMClient:
                 ],
                 "temperature": temperature,
             },
+            timeout,
         )
+        response = await client.send(request)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data["choices"][0]["message"]["content"]
 
+    @classmethod
+    async def call_text_batch(
+        cls,
+        config: LLMConfig,
+        prompts: Sequence[tuple[str, str]],
+        temperature: float = 0.7,
+        max_concurrency: int = 10,
+    ) -> list[str | None]:
+        """Call LLM for many (system, user) prompt pairs concurrently.
+
+        Identical prompt pairs are sent once and share the response. At most
+        ``max_concurrency`` requests are in flight on the shared pool.
+
+        Args:
+            config: LLM configuration
+            prompts: (system_prompt, user_prompt) pairs
+            temperature: Sampling temperature
+            max_concurrency: Maximum number of in-flight requests
+
+        Returns:
+            Text content per prompt pair, in input order (None where the
+            call failed)
+        """
+        unique = list(dict.fromkeys(prompts))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(system_prompt: str, user_prompt: str) -> str:
+            async with semaphore:
+                return await cls.call_text(
+                    config, system_prompt, user_prompt, temperature
+                )
+
+        results = await asyncio.gather(
+            *(bounded(*prompt) for prompt in unique), return_exceptions=True
+        )
+        by_prompt: dict[tuple[str, str], str | None] = {}
+        for prompt, result in zip(unique, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Batch LLM call failed: {result}")
+                result = None
+            by_prompt[prompt] = result
+        return [by_prompt[prompt] for prompt in prompts]
+
     @classmethod
     async def call_stream(
         cls,
@@ -178,46 +356,87 @@ class LLMClient:
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.7,
+        chunk_size: int = 0,
     ) -> AsyncGenerator[str, None]:
         """Call LLM with streaming response.
 
+        Like ``call_stream_with_messages``, the response is read ahead of the
+        consumer, so a slow client (e.g. an SSE response) does not stall the
+        network reads.
+
         Args:
             config: LLM configuration
             system_prompt: System message
             user_prompt: User message
             temperature: Sampling temperature
+            chunk_size: Batch deltas until this many characters are buffered
+                (or 20ms have passed). 0 yields every delta as it arrives.
 
         Yields:
             Text chunks from streaming response
         """
-        client = await cls.get_stream_client()
+        stream = cls._stream_text(
+            config, system_prompt, user_prompt, temperature, chunk_size
+        )
+        async with aclosing(_prefetch(stream)) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    @classmethod
+    async def _stream_text(
+        cls,
+        config: LLMConfig,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        chunk_size: int,
+    ) -> AsyncGenerator[str, None]:
+        """Read text deltas from a streaming chat completion."""
+        client = await cls.get_client()
+        url, headers = cls._endpoint(config)
         async with client.stream(
             "POST",
-            f"{config.base_url}/chat/completions",
-            headers={"Authorization": f"Bearer {config.api_key}"},
-            json={
-                "model": config.model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                "temperature": temperature,
-                "stream": True,
-            },
+            url,
+            headers=headers,
+            content=orjson.dumps(
+                {
+                    "model": config.model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    "temperature": temperature,
+                    "stream": True,
+                }
+            ),
+            timeout=settings.llm_stream_timeout,
         ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data_str = line[6:]
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        content = data["choices"][0]["delta"].get("content", "")
-                        if content:
-                            yield content
-                    except json.JSONDecodeError:
-                        continue
+            loop = asyncio.get_running_loop()
+            buf_parts: list[str] = []
+            buf_len = 0
+            flush_at = 0.0
+            async for payload in _iter_sse_data(response):
+                try:
+                    data = orjson.loads(payload)
+                except orjson.JSONDecodeError:
+                    continue
+                content = data["choices"][0]["delta"].get("content")
+                if not content:
+                    continue
+                if chunk_size <= 0:
+                    yield content
+                    continue
+                if not buf_parts:
+                    flush_at = loop.time() + _STREAM_FLUSH_INTERVAL
+                buf_parts.append(content)
+                buf_len += len(content)
+                if buf_len >= chunk_size or loop.time() >= flush_at:
+                    yield "".join(buf_parts)
+                    buf_parts.clear()
+                    buf_len = 0
+            if buf_parts:
+                yield "".join(buf_parts)
 
     @classmethod
     async def call_stream_with_messages(
@@ -226,67 +445,89 @@ class LLMClient:
         messages: list[dict],
         temperature: float = 0.7,
         max_tokens: int | None = None,
+        include_usage: bool = True,
     ) -> AsyncGenerator[tuple[str, dict | None], None]:
         """Call LLM with streaming response using full messages array.
 
+        The response is read ahead of the consumer into a bounded queue, so
+        network reads overlap with whatever the caller does per chunk.
+
         Args:
             config: LLM configuration
             messages: Full messages array including history
             temperature: Sampling temperature
             max_tokens: Optional max tokens limit
+            include_usage: Ask the server for token counts in a final chunk
 
         Yields:
             Tuple of (chunk, usage) where usage is None until final chunk
-            Final yield is ("", usage_dict) with token counts and model info
+            Final yield is ("", usage_dict) with token counts (when requested)
+            and model info
         """
-        import time
-        start_time = time.time()
+        stream = cls._stream_with_messages(
+            config, messages, temperature, max_tokens, include_usage
+        )
+        async with aclosing(_prefetch(stream)) as items:
+            async for item in items:
+                yield item
 
-        client = await cls.get_stream_client()
+    @classmethod
+    async def _stream_with_messages(
+        cls,
+        config: LLMConfig,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int | None,
+        include_usage: bool,
+    ) -> AsyncGenerator[tuple[str, dict | None], None]:
+        """Read the stream for call_stream_with_messages."""
+        start_ns = time.perf_counter_ns()
+
+        client = await cls.get_client()
         request_body: dict[str, Any] = {
             "model": config.model,
             "messages": messages,
             "temperature": temperature,
             "stream": True,
-            "stream_options": {"include_usage": True},
         }
+        if include_usage:
+            request_body["stream_options"] = {"include_usage": True}
         if max_tokens is not None:
             request_body["max_tokens"] = max_tokens
 
         usage_info: dict | None = None
 
+        url, headers = cls._endpoint(config)
         async with client.stream(
             "POST",
-            f"{config.base_url}/chat/completions",
-            headers={"Authorization": f"Bearer {config.api_key}"},
-            json=request_body,
+            url,
+            headers=headers,
+            content=orjson.dumps(request_body),
+            timeout=settings.llm_stream_timeout,
         ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data_str = line[6:]
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        # Check for usage in final chunk
-                        if "usage" in data and data["usage"]:
-                            usage_info = {
-                                "prompt_tokens": data["usage"].get("prompt_tokens"),
-                                "completion_tokens": data["usage"].get("completion_tokens"),
-                                "total_tokens": data["usage"].get("total_tokens"),
-                                "model": config.model,
-                            }
-                        # Yield content chunk
-                        if "choices" in data and data["choices"]:
-                            content = data["choices"][0].get("delta", {}).get("content", "")
-                            if content:
-                                yield (content, None)
-                    except json.JSONDecodeError:
-                        continue
+            async for payload in _iter_sse_data(response):
+                try:
+                    data = orjson.loads(payload)
+                except orjson.JSONDecodeError:
+                    continue
+                # Check for usage in final chunk
+                if include_usage and (usage := data.get("usage")):
+                    usage_info = {
+                        "prompt_tokens": usage.get("prompt_tokens"),
+                        "completion_tokens": usage.get("completion_tokens"),
+                        "total_tokens": usage.get("total_tokens"),
+                        "model": config.model,
+                    }
+                # Yield content chunk
+                choices = data.get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield (content, None)
 
         # Calculate latency and yield final usage
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         if usage_info:
             usage_info["latency_ms"] = latency_ms
         else:
@@ -305,6 +546,10 @@ class LLMClient:
     ) -> dict:
         """Call LLM and parse JSON response.
 
+        Uses JSON mode directly when the config advertises support for it,
+        otherwise falls back to a plain text call and extracts JSON from the
+        response (including markdown code fences).
+
         Args:
             config: LLM configuration
             system_prompt: System message
@@ -318,27 +563,25 @@ class LLMClient:
         Raises:
             ValueError: If response cannot be parsed as JSON
         """
+        if config.supports_json_mode:
+            return await cls.call_json_mode(
+                config, system_prompt, user_prompt, temperature, timeout
+            )
+
         response_text = await cls.call_text(
             config, system_prompt, user_prompt, temperature, timeout
         )
 
         # Try direct JSON parse
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
+            return orjson.loads(response_text)
+        except orjson.JSONDecodeError:
             pass
 
         # Try extracting from markdown code blocks
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            if json_end > json_start:
-                return json.loads(response_text[json_start:json_end].strip())
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            if json_end > json_start:
-                return json.loads(response_text[json_start:json_end].strip())
+        match = _FENCE_RE.search(response_text)
+        if match:
+            return orjson.loads(match.group(1))
 
         raise ValueError(f"Failed to parse LLM response as JSON: {response_text[:200]}")
 
@@ -363,24 +606,26 @@ class LLMClient:
         Returns:
             Parsed JSON dict from LLM response
         """
-        async with cls.managed_client(timeout or settings.llm_long_timeout) as client:
-            response = await client.post(
-                f"{config.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {config.api_key}"},
-                json={
-                    "model": config.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    "temperature": temperature,
-                    "response_format": {"type": "json_object"},
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-            return json.loads(content)
+        client = await cls.get_client()
+        request = cls._build_request(
+            client,
+            config,
+            {
+                "model": config.model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "temperature": temperature,
+                "response_format": {"type": "json_object"},
+            },
+            timeout or settings.llm_long_timeout,
+        )
+        response = await client.send(request)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        content = data["choices"][0]["message"]["content"]
+        return orjson.loads(content)
 
     @classmethod
     async def call_structured(
@@ -405,11 +650,11 @@ class LLMClient:
         Returns:
             Parsed JSON dict matching the schema
         """
-        client = await cls.get_client(timeout)
-        response = await client.post(
-            f"{config.base_url}/chat/completions",
-            headers={"Authorization": f"Bearer {config.api_key}"},
-            json={
+        client = await cls.get_client()
+        request = cls._build_request(
+            client,
+            config,
+            {
                 "model": config.model,
                 "messages": [
                     {"role": "system", "content": system_prompt},
@@ -418,11 +663,13 @@ class LLMClient:
                 "temperature": temperature,
                 "response_format": response_schema,
             },
+            timeout,
         )
+        response = await client.send(request)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         content = data["choices"][0]["message"]["content"]
-        return json.loads(content)
+        return orjson.loads(content)
 
     @classmethod
     async def call_with_messages(
@@ -445,23 +692,22 @@ class LLMClient:
         Returns:
             Text content from LLM response
         """
-        async with cls.managed_client(timeout or settings.llm_long_timeout) as client:
-            request_body: dict[str, Any] = {
-                "model": config.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-            if max_tokens is not None:
-                request_body["max_tokens"] = max_tokens
+        client = await cls.get_client()
+        request_body: dict[str, Any] = {
+            "model": config.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            request_body["max_tokens"] = max_tokens
 
-            response = await client.post(
-                f"{config.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {config.api_key}"},
-                json=request_body,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        request = cls._build_request(
+            client, config, request_body, timeout or settings.llm_long_timeout
+        )
+        response = await client.send(request)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        return data["choices"][0]["message"]["content"]
 
     # ========== Methods with usage/latency tracking ==========
 
@@ -488,13 +734,11 @@ class LLMClient:
         Returns:
             LLMResponse with parsed JSON content, usage stats, and latency
         """
-        client = await cls.get_client(timeout)
-        start_time = time.time()
-
-        response = await client.post(
-            f"{config.base_url}/chat/completions",
-            headers={"Authorization": f"Bearer {config.api_key}"},
-            json={
+        client = await cls.get_client()
+        request = cls._build_request(
+            client,
+            config,
+            {
                 "model": config.model,
                 "messages": [
                     {"role": "system", "content": system_prompt},
@@ -503,11 +747,14 @@ class LLMClient:
                 "temperature": temperature,
                 "response_format": response_schema,
             },
+            timeout,
         )
-        latency_ms = (time.time() - start_time) * 1000
+        start_ns = time.perf_counter_ns()
+        response = await client.send(request)
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         content = data["choices"][0]["message"]["content"]
         usage = LLMUsage.from_response(data)
 
@@ -538,30 +785,98 @@ class LLMClient:
         Returns:
             LLMResponse with text content, usage stats, and latency
         """
-        async with cls.managed_client(timeout or settings.llm_long_timeout) as client:
-            request_body: dict[str, Any] = {
-                "model": config.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-            if max_tokens is not None:
-                request_body["max_tokens"] = max_tokens
+        client = await cls.get_client()
+        request_body: dict[str, Any] = {
+            "model": config.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            request_body["max_tokens"] = max_tokens
 
-            start_time = time.time()
-            response = await client.post(
-                f"{config.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {config.api_key}"},
-                json=request_body,
-            )
-            latency_ms = (time.time() - start_time) * 1000
+        request = cls._build_request(
+            client, config, request_body, timeout or settings.llm_long_timeout
+        )
+        start_ns = time.perf_counter_ns()
+        response = await client.send(request)
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-            usage = LLMUsage.from_response(data)
-
-            return LLMResponse(
-                content=content,
-                usage=usage,
-                latency_ms=latency_ms,
-            )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        content = data["choices"][0]["message"]["content"]
+        usage = LLMUsage.from_response(data)
+
+        return LLMResponse(
+            content=content,
+            usage=usage,
+            latency_ms=latency_ms,
+        )
+
+    # ========== Embeddings ==========
+
+    @classmethod
+    async def call_embeddings(
+        cls,
+        config: LLMConfig,
+        inputs: list[str],
+        batch_size: int = 256,
+        timeout: float | None = None,
+        max_concurrency: int = 16,
+    ) -> list[list[float]]:
+        """Embed many texts with as few requests as possible.
+
+        Inputs are sent ``batch_size`` at a time (the OpenAI embeddings API
+        accepts a list per request) and the batches run concurrently on the
+        shared connection pool. For backends that only accept one input per
+        request, pass ``batch_size=1``: the requests still overlap, at most
+        ``max_concurrency`` at a time.
+
+        Args:
+            config: Embedding LLM configuration
+            inputs: Texts to embed
+            batch_size: Maximum inputs per request
+            timeout: Optional timeout override
+            max_concurrency: Maximum number of in-flight requests
+
+        Returns:
+            One embedding per input, in input order
+        """
+        batches = [
+            inputs[i : i + batch_size] for i in range(0, len(inputs), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await cls._embed_batch(config, batch, timeout)
+
+        results = await asyncio.gather(*(bounded(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch]
+
+    @classmethod
+    async def _embed_batch(
+        cls,
+        config: LLMConfig,
+        inputs: list[str],
+        timeout: float | None,
+    ) -> list[list[float]]:
+        """Embed one batch of inputs in a single request."""
+        client = await cls.get_client()
+        _, headers = cls._endpoint(config)
+        body: dict[str, Any] = {"model": config.model, "input": inputs}
+        # Models such as text-embedding-3-* shorten vectors server-side
+        dimensions = (config.options or {}).get("dimensions")
+        if dimensions:
+            body["dimensions"] = dimensions
+        request = client.build_request(
+            "POST",
+            f"{config.base_url}/embeddings",
+            headers=headers,
+            content=orjson.dumps(body),
+            timeout=timeout or httpx.USE_CLIENT_DEFAULT,
+        )
+        response = await client.send(request)
+        response.raise_for_status()
+        data = orjson.loads(response.content)["data"]
+        data.sort(key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
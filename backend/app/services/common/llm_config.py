@@ -1,14 +1,41 @@
 """LLM configuration management utilities."""
 
 import logging
+from typing import Any
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import case, event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.llm_config import LLMConfig, LLMConfigType
 
 logger = logging.getLogger(__name__)
 
+# (config type, requested config ID) -> column values of the resolved config
+_CFG_CACHE: TTLCache[tuple[str, str | None], dict[str, Any]] = TTLCache(
+    maxsize=64, ttl=60
+)
+
+
+# Plain column selection, so lookups return rows rather than ORM entities
+_COLUMNS = tuple(
+    getattr(LLMConfig, attr.key) for attr in inspect(LLMConfig).column_attrs
+)
+
+
+@event.listens_for(LLMConfig, "after_insert")
+@event.listens_for(LLMConfig, "after_update")
+@event.listens_for(LLMConfig, "after_delete")
+def _invalidate_config_cache(*_: Any) -> None:
+    """Drop cached lookups whenever any LLM config is written.
+
+    Any write can change which config a lookup resolves to (a new default,
+    a soft delete), so the whole cache is cleared rather than one entry.
+    Mapper events only fire in the writing process; other workers rely on
+    the TTL.
+    """
+    _CFG_CACHE.clear()
+
 
 class LLMConfigManager:
     """Centralized LLM configuration management.
@@ -66,6 +93,12 @@ class LLMConfigManager:
     ) -> LLMConfig | None:
         """Internal method to get LLM config by type.
 
+        Only the config's columns are selected, and resolved configs are
+        cached for 60 seconds per (type, config_id). Writes in this process
+        clear the cache at once; writes through other workers take effect here
+        once the entry expires. The returned config is always a fresh
+        transient instance that is not attached to ``db``.
+
         Args:
             db: Database session
             config_type: Type of config (CHAT or EMBEDDING)
@@ -74,49 +107,55 @@ class LLMConfigManager:
         Returns:
             LLMConfig if found, None otherwise
         """
-        # 1. Try specified config_id
-        if config_id:
-            result = await db.execute(
-                select(LLMConfig).where(
-                    LLMConfig.id == config_id,
-                    LLMConfig.type == config_type,
-                    LLMConfig.deleted_at.is_(None),
-                )
-            )
-            config = result.scalar_one_or_none()
-            if config:
-                return config
-            logger.warning(
-                f"Specified {config_type.value} config {config_id} not found, "
-                "falling back to default"
-            )
+        key = (config_type.value, config_id)
+        values = _CFG_CACHE.get(key)
+        if values is None:
+            values = await LLMConfigManager._query_config(db, config_type, config_id)
+            if values is None:
+                return None
+            _CFG_CACHE[key] = values
+        return LLMConfig(**values)
 
-        # 2. Try default config
-        result = await db.execute(
-            select(LLMConfig).where(
-                LLMConfig.type == config_type,
-                LLMConfig.is_default.is_(True),
-                LLMConfig.deleted_at.is_(None),
-            )
-        )
-        config = result.scalar_one_or_none()
-        if config:
-            return config
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached config lookups."""
+        _CFG_CACHE.clear()
+
+    @staticmethod
+    async def _query_config(
+        db: AsyncSession,
+        config_type: LLMConfigType,
+        config_id: str | None = None,
+    ) -> dict[str, Any] | None:
+        """Resolve a config's column values from the database, bypassing the cache.
+
+        A single query ranks the candidates: the requested config first, then
+        the default config, then any other config of the type.
+        """
+        priority = [(LLMConfig.is_default.is_(True), 1)]
+        if config_id:
+            priority.insert(0, (LLMConfig.id == config_id, 0))
 
-        # 3. Fallback to any available config
         result = await db.execute(
-            select(LLMConfig)
+            select(*_COLUMNS)
             .where(
                 LLMConfig.type == config_type,
                 LLMConfig.deleted_at.is_(None),
             )
+            .order_by(case(*priority, else_=2))
             .limit(1)
         )
-        config = result.scalar_one_or_none()
-        if not config:
+        row = result.one_or_none()
+        if not row:
             logger.warning(f"No {config_type.value} LLM config available")
+            return None
 
-        return config
+        if config_id and row.id != config_id:
+            logger.warning(
+                f"Specified {config_type.value} config {config_id} not found, "
+                "falling back to default"
+            )
+        return row._asdict()
 
     @staticmethod
     async def get_config_by_id(
@@ -17,7 +17,7 @@ Usage:
 
 from .chain_analyzer import ChainAnalyzer
 from .clue_enhancer import ClueEnhancer
-from .llm_base import LLMBase
+from .llm_base import LLMBase, StreamedText
 from .npc_enhancer import NPCEnhancer
 from .service import AIEnhancementService
 
@@ -30,4 +30,5 @@ __all__ = [
     "ChainAnalyzer",
     # Base
     "LLMBase",
+    "StreamedText",
 ]
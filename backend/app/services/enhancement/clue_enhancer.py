@@ -1,16 +1,85 @@
 """Clue enhancement operations."""
 
-import logging
+import asyncio
 from collections.abc import AsyncGenerator
+from typing import TypedDict
 
-from .llm_base import LLMBase
+from pydantic import TypeAdapter
 
-logger = logging.getLogger(__name__)
+from app.models.llm_config import LLMConfig
+from app.services.common import LLMClient, LLMConfigManager
+
+from .llm_base import LLMBase, StreamedText
+
+_POLISH_DETAIL_SYS = """你是一位专业的剧本杀编剧助手。你的任务是润色和改进线索描述，使其：
+1. 更加生动、有画面感
+2. 保持神秘感，不直接透露答案
+3. 语言流畅，符合故事背景
+4. 保留原有的关键信息
+
+请直接返回润色后的线索描述，不要添加任何解释或前缀。"""
+
+_KEYWORDS_SYS = """你是一位专业的剧本杀编剧助手。你的任务是为线索生成触发关键词。
+这些关键词是玩家可能会询问的词汇，用于触发NPC透露这条线索。
+
+请返回JSON格式：{"keywords": ["关键词1", "关键词2", ...]}
+
+要求：
+1. 关键词应该自然、符合玩家询问习惯
+2. 包含直接相关的关键词和间接相关的关键词
+3. 建议5-10个关键词
+4. 避免太宽泛的词汇"""
+
+_SEMANTIC_SUMMARY_SYS = """你是一位专业的语义向量优化专家。你的任务是为线索生成用于向量嵌入(Embedding)匹配的语义摘要。
+
+这个摘要会被转换为向量，与玩家的提问进行余弦相似度匹配。当相似度足够高时，这条线索会被触发。
+
+请生成一个优化的语义摘要，要求：
+
+1. **核心语义提取**：用简洁的语言概括线索的核心信息和关键事实
+2. **问题形式覆盖**：包含玩家可能会问的问题形式，例如：
+   - "关于XXX的情况是什么？"
+   - "谁做了XXX？"
+   - "XXX发生了什么？"
+3. **同义词扩展**：包含关键概念的同义词或近义词，提高匹配率
+4. **场景描述**：简要描述什么场景/话题下玩家会询问到这条线索
+
+格式要求：
+- 直接返回摘要文本，不要有解释或前缀
+- 控制在50-150字之间
+- 使用自然语言，不要用列表格式"""
+
+
+class KeywordsResult(TypedDict):
+    """Shape of the keyword suggestion response."""
+
+    keywords: list[str]
+
+
+_KEYWORDS_ADAPTER = TypeAdapter(KeywordsResult)
+
+_KEYWORDS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trigger_keywords",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "keywords": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["keywords"],
+            "additionalProperties": False,
+        },
+    },
+}
 
 
 class ClueEnhancer(LLMBase):
     """Enhances clue content including polishing, keywords, and semantic summaries."""
 
+    __slots__ = ()
+
     async def polish_detail(
         self,
         clue_name: str,
@@ -30,26 +99,20 @@ class ClueEnhancer(LLMBase):
         Returns:
             Polished clue detail text
         """
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        system_prompt = """你是一位专业的剧本杀编剧助手。你的任务是润色和改进线索描述，使其：
-1. 更加生动、有画面感
-2. 保持神秘感，不直接透露答案
-3. 语言流畅，符合故事背景
-4. 保留原有的关键信息
-
-请直接返回润色后的线索描述，不要添加任何解释或前缀。"""
-
-        user_prompt = f"""请润色以下线索描述：
-
-线索名称：{clue_name}
-当前描述：{clue_detail}
-"""
-        if context:
-            user_prompt += f"\n故事背景：{context}"
+        config = await self._require_chat_config(llm_config_id)
+        return await self._polish_detail(config, clue_name, clue_detail, context)
 
+    async def _polish_detail(
+        self,
+        config: LLMConfig,
+        clue_name: str,
+        clue_detail: str,
+        context: str | None,
+    ) -> str:
+        """Polish clue detail text with an already resolved config."""
+        system_prompt, user_prompt = self._build_polish_prompts(
+            clue_name, clue_detail, context
+        )
         result = await self._call_llm_text(config, system_prompt, user_prompt)
         return result.strip()
 
@@ -61,18 +124,31 @@ class ClueEnhancer(LLMBase):
         llm_config_id: str | None = None,
     ) -> AsyncGenerator[str, None]:
         """Stream polish clue detail text."""
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        system_prompt = """你是一位专业的剧本杀编剧助手。你的任务是润色和改进线索描述，使其：
-1. 更加生动、有画面感
-2. 保持神秘感，不直接透露答案
-3. 语言流畅，符合故事背景
-4. 保留原有的关键信息
+        config = await self._require_chat_config(llm_config_id)
 
-请直接返回润色后的线索描述，不要添加任何解释或前缀。"""
+        system_prompt, user_prompt = self._build_polish_prompts(
+            clue_name, clue_detail, context
+        )
+        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
+            yield chunk
 
+    def polish_detail_iter(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        context: str | None = None,
+        llm_config_id: str | None = None,
+    ) -> StreamedText:
+        """Stream polished clue detail without leading whitespace."""
+        return StreamedText(
+            self.polish_detail_stream(clue_name, clue_detail, context, llm_config_id)
+        )
+
+    @staticmethod
+    def _build_polish_prompts(
+        clue_name: str, clue_detail: str, context: str | None
+    ) -> tuple[str, str]:
+        """Build the (system, user) prompts shared by both polish variants."""
         user_prompt = f"""请润色以下线索描述：
 
 线索名称：{clue_name}
@@ -80,9 +156,7 @@ class ClueEnhancer(LLMBase):
 """
         if context:
             user_prompt += f"\n故事背景：{context}"
-
-        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
-            yield chunk
+        return _POLISH_DETAIL_SYS, user_prompt
 
     async def suggest_trigger_keywords(
         self,
@@ -103,21 +177,19 @@ class ClueEnhancer(LLMBase):
         Returns:
             List of suggested keywords
         """
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        system_prompt = """你是一位专业的剧本杀编剧助手。你的任务是为线索生成触发关键词。
-这些关键词是玩家可能会询问的词汇，用于触发NPC透露这条线索。
-
-请返回JSON格式：{"keywords": ["关键词1", "关键词2", ...]}
-
-要求：
-1. 关键词应该自然、符合玩家询问习惯
-2. 包含直接相关的关键词和间接相关的关键词
-3. 建议5-10个关键词
-4. 避免太宽泛的词汇"""
+        config = await self._require_chat_config(llm_config_id)
+        return await self._suggest_keywords(
+            config, clue_name, clue_detail, existing_keywords
+        )
 
+    async def _suggest_keywords(
+        self,
+        config: LLMConfig,
+        clue_name: str,
+        clue_detail: str,
+        existing_keywords: list[str] | None,
+    ) -> list[str]:
+        """Suggest trigger keywords with an already resolved config."""
         user_prompt = f"""请为以下线索生成触发关键词：
 
 线索名称：{clue_name}
@@ -126,8 +198,10 @@ class ClueEnhancer(LLMBase):
         if existing_keywords:
             user_prompt += f"\n已有关键词（可参考但不要重复）：{', '.join(existing_keywords)}"
 
-        result = await self._call_llm_json(config, system_prompt, user_prompt)
-        return result.get("keywords", [])
+        result = await self._call_llm_structured(
+            config, _KEYWORDS_SYS, user_prompt, _KEYWORDS_SCHEMA
+        )
+        return _KEYWORDS_ADAPTER.validate_python(result)["keywords"]
 
     async def generate_semantic_summary(
         self,
@@ -146,36 +220,162 @@ class ClueEnhancer(LLMBase):
         Returns:
             Semantic summary text optimized for embedding matching
         """
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
+        config = await self._require_chat_config(llm_config_id)
+        return await self._semantic_summary(config, clue_name, clue_detail)
 
-        system_prompt = """你是一位专业的语义向量优化专家。你的任务是为线索生成用于向量嵌入(Embedding)匹配的语义摘要。
+    async def _semantic_summary(
+        self,
+        config: LLMConfig,
+        clue_name: str,
+        clue_detail: str,
+    ) -> str:
+        """Generate a semantic summary with an already resolved config."""
+        system_prompt, user_prompt = self._build_summary_prompts(clue_name, clue_detail)
+        result = await self._call_llm_text(config, system_prompt, user_prompt)
+        return result.strip()
 
-这个摘要会被转换为向量，与玩家的提问进行余弦相似度匹配。当相似度足够高时，这条线索会被触发。
+    # ========== Batch operations ==========
 
-请生成一个优化的语义摘要，要求：
+    async def enhance_all(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        context: str | None = None,
+        existing_keywords: list[str] | None = None,
+        llm_config_id: str | None = None,
+    ) -> dict:
+        """
+        Polish detail, suggest keywords and summarize a clue concurrently.
 
-1. **核心语义提取**：用简洁的语言概括线索的核心信息和关键事实
-2. **问题形式覆盖**：包含玩家可能会问的问题形式，例如：
-   - "关于XXX的情况是什么？"
-   - "谁做了XXX？"
-   - "XXX发生了什么？"
-3. **同义词扩展**：包含关键概念的同义词或近义词，提高匹配率
-4. **场景描述**：简要描述什么场景/话题下玩家会询问到这条线索
+        Returns:
+            Dict with polished_detail, keywords and semantic_summary
+        """
+        config = await self._get_batch_chat_config(llm_config_id)
+        polished, keywords, summary = await asyncio.gather(
+            self._polish_detail(config, clue_name, clue_detail, context),
+            self._suggest_keywords(
+                config, clue_name, clue_detail, existing_keywords
+            ),
+            self._semantic_summary(config, clue_name, clue_detail),
+        )
+        return {
+            "polished_detail": polished,
+            "keywords": keywords,
+            "semantic_summary": summary,
+        }
+
+    async def suggest_trigger_keywords_batch(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[list[str] | None]:
+        """
+        Suggest trigger keywords for many clues concurrently.
 
-格式要求：
-- 直接返回摘要文本，不要有解释或前缀
-- 控制在50-150字之间
-- 使用自然语言，不要用列表格式"""
+        Args:
+            clues: List of clue dictionaries with name, detail, and optional
+                trigger_keywords
+            llm_config_id: Optional LLM config ID
+            max_concurrency: Maximum number of in-flight LLM calls
 
-        user_prompt = f"""请为以下线索生成向量匹配优化的语义摘要：
+        Returns:
+            Keywords per clue, in input order (None where the call failed)
+        """
+        config = await self._get_batch_chat_config(llm_config_id)
+        return await self._gather_bounded(
+            (
+                self._suggest_keywords(
+                    config,
+                    clue["name"],
+                    clue.get("detail") or "",
+                    clue.get("trigger_keywords"),
+                )
+                for clue in clues
+            ),
+            max_concurrency,
+        )
+
+    async def generate_semantic_summary_batch(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[str | None]:
+        """
+        Generate semantic summaries for many clues concurrently.
 
-线索名称：{clue_name}
-线索详情：{clue_detail}"""
+        Args:
+            clues: List of clue dictionaries with name and detail
+            llm_config_id: Optional LLM config ID
+            max_concurrency: Maximum number of in-flight LLM calls
 
-        result = await self._call_llm_text(config, system_prompt, user_prompt)
-        return result.strip()
+        Returns:
+            Summary per clue, in input order (None where the call failed)
+        """
+        config = await self._get_batch_chat_config(llm_config_id)
+        if config.response_cache_ttl <= 0 and config.semantic_cache_threshold is None:
+            # No response caches to consult: send the prompts as one batch so
+            # duplicate clues share a single provider call.
+            results = await LLMClient.call_text_batch(
+                config,
+                [
+                    self._build_summary_prompts(clue["name"], clue.get("detail") or "")
+                    for clue in clues
+                ],
+                max_concurrency=max_concurrency,
+            )
+            return [r.strip() if r is not None else None for r in results]
+        return await self._gather_bounded(
+            (
+                self._semantic_summary(config, clue["name"], clue.get("detail") or "")
+                for clue in clues
+            ),
+            max_concurrency,
+        )
+
+    async def generate_semantic_summaries_with_embeddings(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        embedding_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[tuple[str, list[float]] | None]:
+        """
+        Generate semantic summaries for many clues and embed them together.
+
+        The summaries are produced like ``generate_semantic_summary_batch``
+        and then embedded with a single batched embeddings call instead of
+        one call per clue.
+
+        Args:
+            clues: List of clue dictionaries with name and detail
+            llm_config_id: Optional chat LLM config ID
+            embedding_config_id: Optional embedding LLM config ID
+            max_concurrency: Maximum number of in-flight chat calls
+
+        Returns:
+            (summary, embedding) per clue, in input order (None where the
+            summary call failed)
+
+        Raises:
+            ValueError: If no chat or embedding config is available
+        """
+        embedding_config = await LLMConfigManager.get_embedding_config(
+            self.db, embedding_config_id
+        )
+        if not embedding_config:
+            raise ValueError("No embedding LLM configuration available")
+
+        summaries = await self.generate_semantic_summary_batch(
+            clues, llm_config_id, max_concurrency
+        )
+        texts = [summary for summary in summaries if summary is not None]
+        embeddings = iter(await LLMClient.call_embeddings(embedding_config, texts))
+        return [
+            (summary, next(embeddings)) if summary is not None else None
+            for summary in summaries
+        ]
 
     async def generate_semantic_summary_stream(
         self,
@@ -184,33 +384,28 @@ class ClueEnhancer(LLMBase):
         llm_config_id: str | None = None,
     ) -> AsyncGenerator[str, None]:
         """Stream semantic summary generation for embedding matching."""
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        system_prompt = """你是一位专业的语义向量优化专家。你的任务是为线索生成用于向量嵌入(Embedding)匹配的语义摘要。
-
-这个摘要会被转换为向量，与玩家的提问进行余弦相似度匹配。当相似度足够高时，这条线索会被触发。
-
-请生成一个优化的语义摘要，要求：
+        config = await self._require_chat_config(llm_config_id)
 
-1. **核心语义提取**：用简洁的语言概括线索的核心信息和关键事实
-2. **问题形式覆盖**：包含玩家可能会问的问题形式，例如：
-   - "关于XXX的情况是什么？"
-   - "谁做了XXX？"
-   - "XXX发生了什么？"
-3. **同义词扩展**：包含关键概念的同义词或近义词，提高匹配率
-4. **场景描述**：简要描述什么场景/话题下玩家会询问到这条线索
-
-格式要求：
-- 直接返回摘要文本，不要有解释或前缀
-- 控制在50-150字之间
-- 使用自然语言，不要用列表格式"""
+        system_prompt, user_prompt = self._build_summary_prompts(clue_name, clue_detail)
+        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
+            yield chunk
 
+    def generate_semantic_summary_iter(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        llm_config_id: str | None = None,
+    ) -> StreamedText:
+        """Stream a semantic summary without leading whitespace."""
+        return StreamedText(
+            self.generate_semantic_summary_stream(clue_name, clue_detail, llm_config_id)
+        )
+
+    @staticmethod
+    def _build_summary_prompts(clue_name: str, clue_detail: str) -> tuple[str, str]:
+        """Build the (system, user) prompts shared by both summary variants."""
         user_prompt = f"""请为以下线索生成向量匹配优化的语义摘要：
 
 线索名称：{clue_name}
 线索详情：{clue_detail}"""
-
-        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
-            yield chunk
+        return _SEMANTIC_SUMMARY_SYS, user_prompt
@@ -1,8 +1,22 @@
 """LLM base utilities for enhancement service with streaming support."""
 
+import asyncio
+import hashlib
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections import OrderedDict
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Hashable,
+    Iterable,
+)
+from typing import Any, TypeVar
 
+import httpx
+import numpy as np
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.llm_config import LLMConfig
@@ -10,6 +24,156 @@ from app.services.common import LLMClient, LLMConfigManager
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Marks a per-instance lookup that has not been made yet (None is a result)
+_UNRESOLVED = object()
+
+
+class SemanticCache:
+    """In-memory cache of LLM responses looked up by prompt embedding.
+
+    Entries are partitioned by chat model, embedding space and system prompt
+    (see ``partition``): vectors from different embedding models or sizes
+    are not comparable, and a polish reply must never answer a summary or
+    keyword call on the same clue. A lookup returns the response of the most
+    similar stored prompt when its cosine similarity reaches the caller's
+    threshold. Each partition keeps its newest ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # partition -> (unit-normalized prompt vectors, responses)
+        self._entries: dict[Hashable, tuple[np.ndarray, list[str]]] = {}
+
+    @staticmethod
+    def partition(
+        chat_config: LLMConfig, embedding_config: LLMConfig, system_prompt: str
+    ) -> tuple:
+        """Build the partition key for a chat model, embedding space and task.
+
+        The system prompt identifies the call kind (polish, summary,
+        keywords, ...), so it is part of the key as a SHA-256 digest.
+        """
+        return (
+            chat_config.model,
+            embedding_config.base_url,
+            embedding_config.model,
+            (embedding_config.options or {}).get("dimensions"),
+            hashlib.sha256(system_prompt.encode()).hexdigest(),
+        )
+
+    def get(
+        self, partition: Hashable, vector: list[float], threshold: float
+    ) -> str | None:
+        """Return the cached response for the closest prompt, if close enough."""
+        entry = self._entries.get(partition)
+        # A vector of another size cannot be compared; treat it as a miss
+        if entry is not None and entry[0].shape[1] == len(vector):
+            vectors, responses = entry
+            scores = vectors @ self._normalize(vector)
+            best = int(np.argmax(scores))
+            if scores[best] >= threshold:
+                self.hits += 1
+                return responses[best]
+        self.misses += 1
+        return None
+
+    def put(self, partition: Hashable, vector: list[float], response: str) -> None:
+        """Store a response, evicting the oldest entry when full."""
+        row = self._normalize(vector)[np.newaxis, :]
+        entry = self._entries.get(partition)
+        if entry is None or entry[0].shape[1] != row.shape[1]:
+            self._entries[partition] = (row, [response])
+            return
+        vectors, responses = entry
+        vectors = np.vstack((vectors, row))[-self.max_entries :]
+        responses = (responses + [response])[-self.max_entries :]
+        self._entries[partition] = (vectors, responses)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+semantic_cache = SemanticCache()
+
+
+class ExactCache:
+    """In-memory LRU cache of LLM responses keyed by a prompt digest.
+
+    Each entry carries its own expiry, so configs can use different TTLs.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @staticmethod
+    def key(kind: str, model: str, system_prompt: str, user_prompt: str) -> str:
+        """Build the SHA-256 cache key for a call kind, model and prompt pair."""
+        payload = orjson.dumps([kind, model, system_prompt, user_prompt])
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Return a live cached value, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting the least recently used."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+exact_cache = ExactCache()
+
+
+class StreamedText:
+    """Streamed LLM text with the response's leading whitespace dropped.
+
+    The clue SSE endpoints stream through this, so clients see the same
+    start as the stripped blocking variants: models often open with a
+    newline or spaces, which would otherwise arrive as a blank first chunk.
+    Whitespace after the first non-blank chunk is passed through unchanged.
+    """
+
+    def __init__(self, chunks: AsyncIterator[str]) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self) -> AsyncGenerator[str, None]:
+        started = False
+        async for chunk in self._chunks:
+            if not started:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                started = True
+            yield chunk
+
 
 class LLMBase:
     """Base class for LLM operations with streaming support.
@@ -18,13 +182,88 @@ class LLMBase:
     and API calls.
     """
 
+    __slots__ = ("db", "_config_cache", "_embedding_config")
+
     def __init__(self, db: AsyncSession) -> None:
         """Initialize with database session."""
         self.db = db
+        # Resolved chat configs by requested ID, for the lifetime of this
+        # instance (one request). Misses are not stored.
+        self._config_cache: dict[str | None, LLMConfig] = {}
+        # Default embedding config for the semantic cache, once resolved
+        # (None when there is none); _UNRESOLVED until then.
+        self._embedding_config: LLMConfig | None | object = _UNRESOLVED
 
     async def _get_chat_config(self, config_id: str | None = None) -> LLMConfig | None:
         """Get chat LLM configuration."""
-        return await LLMConfigManager.get_chat_config(self.db, config_id)
+        if config_id in self._config_cache:
+            return self._config_cache[config_id]
+        config = await LLMConfigManager.get_chat_config(self.db, config_id)
+        if config:
+            self._config_cache[config_id] = config
+        return config
+
+    async def _require_chat_config(self, config_id: str | None = None) -> LLMConfig:
+        """Get chat LLM configuration, failing when none is available.
+
+        Raises:
+            ValueError: If no chat config is available
+        """
+        config = await self._get_chat_config(config_id)
+        if config is None:
+            raise ValueError("No chat LLM configuration available")
+        return config
+
+    async def _get_embedding_config(self) -> LLMConfig | None:
+        """Get the default embedding config, resolved once per instance.
+
+        Unlike chat configs, a miss is remembered too, so concurrent calls
+        never fall through to ``self.db`` once a batch has resolved it.
+        """
+        if self._embedding_config is _UNRESOLVED:
+            self._embedding_config = await LLMConfigManager.get_embedding_config(
+                self.db
+            )
+        return self._embedding_config
+
+    async def _get_batch_chat_config(self, config_id: str | None = None) -> LLMConfig:
+        """Resolve the chat config for a batch of concurrent LLM calls.
+
+        Everything the concurrent calls look up through ``self.db`` is
+        resolved here first, because an AsyncSession cannot be used
+        concurrently. The embedding config (needed by the semantic cache)
+        is kept on the instance, so the workers never query for it.
+
+        Raises:
+            ValueError: If no chat config is available
+        """
+        config = await self._require_chat_config(config_id)
+        if config.semantic_cache_threshold is not None:
+            await self._get_embedding_config()
+        return config
+
+    @staticmethod
+    async def _gather_bounded(
+        calls: Iterable[Awaitable[T]], max_concurrency: int
+    ) -> list[T | None]:
+        """Run calls concurrently, at most ``max_concurrency`` at a time.
+
+        Results keep the input order. A failed call is logged and yields
+        None so one bad item does not discard the rest of the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(call: Awaitable[T]) -> T:
+            async with semaphore:
+                return await call
+
+        results = await asyncio.gather(
+            *(bounded(call) for call in calls), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Batch LLM call failed: {result}")
+        return [None if isinstance(r, Exception) else r for r in results]
 
     async def _call_llm_text(
         self,
@@ -32,18 +271,83 @@ class LLMBase:
         system_prompt: str,
         user_prompt: str,
     ) -> str:
-        """Call LLM and return text response."""
-        return await LLMClient.call_text(config, system_prompt, user_prompt)
+        """Call LLM and return text response.
+
+        When the config sets ``response_cache_ttl``, an identical earlier
+        call's response is reused for that many seconds.
+        """
+        ttl = config.response_cache_ttl
+        key = None
+        if ttl > 0:
+            key = ExactCache.key("text", config.model, system_prompt, user_prompt)
+            cached = exact_cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = await self._call_llm_text_semantic(config, system_prompt, user_prompt)
+        if key:
+            exact_cache.set(key, result, ttl)
+        return result
+
+    async def _call_llm_text_semantic(
+        self,
+        config: LLMConfig,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """Call LLM for text, consulting the semantic cache when enabled.
+
+        When the config sets ``semantic_cache_threshold``, user prompts are
+        embedded with the default embedding config and a sufficiently
+        similar earlier prompt's response (under the same system prompt) is
+        returned without calling the chat model.
+        """
+        threshold = config.semantic_cache_threshold
+        if threshold is None:
+            return await LLMClient.call_text(config, system_prompt, user_prompt)
 
-    async def _call_llm_stream(
+        embedded = await self._embed_prompt(user_prompt)
+        if embedded is not None:
+            embedding_config, vector = embedded
+            partition = SemanticCache.partition(config, embedding_config, system_prompt)
+            cached = semantic_cache.get(partition, vector, threshold)
+            if cached is not None:
+                return cached
+
+        result = await LLMClient.call_text(config, system_prompt, user_prompt)
+        if embedded is not None:
+            semantic_cache.put(partition, vector, result)
+        return result
+
+    async def _embed_prompt(
+        self, user_prompt: str
+    ) -> tuple[LLMConfig, list[float]] | None:
+        """Embed a user prompt for the semantic cache, or None if unavailable.
+
+        A failed request or a malformed response only skips the cache; the
+        chat call still goes ahead.
+
+        Returns:
+            Tuple of (embedding config used, prompt vector)
+        """
+        embedding_config = await self._get_embedding_config()
+        if not embedding_config:
+            return None
+        try:
+            [vector] = await LLMClient.call_embeddings(embedding_config, [user_prompt])
+        except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        return embedding_config, vector
+
+    def _call_llm_stream(
         self,
         config: LLMConfig,
         system_prompt: str,
         user_prompt: str,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncIterator[str]:
         """Call LLM with streaming response."""
-        async for chunk in LLMClient.call_stream(config, system_prompt, user_prompt):
-            yield chunk
+        return LLMClient.call_stream(config, system_prompt, user_prompt)
 
     async def _call_llm_json(
         self,
@@ -51,5 +355,52 @@ class LLMBase:
         system_prompt: str,
         user_prompt: str,
     ) -> dict:
-        """Call LLM and parse JSON response."""
-        return await LLMClient.call_json(config, system_prompt, user_prompt)
+        """Call LLM and parse JSON response.
+
+        Honors ``response_cache_ttl`` like ``_call_llm_text``. Results are
+        cached serialized, so every caller gets its own copy.
+        """
+        ttl = config.response_cache_ttl
+        if ttl <= 0:
+            return await LLMClient.call_json(config, system_prompt, user_prompt)
+
+        key = ExactCache.key("json", config.model, system_prompt, user_prompt)
+        cached = exact_cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        result = await LLMClient.call_json(config, system_prompt, user_prompt)
+        exact_cache.set(key, orjson.dumps(result), ttl)
+        return result
+
+    async def _call_llm_structured(
+        self,
+        config: LLMConfig,
+        system_prompt: str,
+        user_prompt: str,
+        response_schema: dict[str, Any],
+    ) -> dict:
+        """Call LLM with a JSON schema response format and parse the result.
+
+        Honors ``response_cache_ttl`` like ``_call_llm_json``; entries are
+        keyed by the schema name as well as the prompts.
+        """
+        ttl = config.response_cache_ttl
+        if ttl <= 0:
+            return await LLMClient.call_structured(
+                config, system_prompt, user_prompt, response_schema
+            )
+
+        schema_name = response_schema.get("json_schema", {}).get("name", "")
+        key = ExactCache.key(
+            f"structured:{schema_name}", config.model, system_prompt, user_prompt
+        )
+        cached = exact_cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        result = await LLMClient.call_structured(
+            config, system_prompt, user_prompt, response_schema
+        )
+        exact_cache.set(key, orjson.dumps(result), ttl)
+        return result
@@ -1,16 +1,40 @@
 """NPC enhancement operations."""
 
-import logging
 from collections.abc import AsyncGenerator
+from types import MappingProxyType
 
 from .llm_base import LLMBase
 
-logger = logging.getLogger(__name__)
+_FIELD_PROMPTS = MappingProxyType(
+    {
+        "background": "背景故事，使其更加丰富、有层次感",
+        "personality": "性格描述，使其更加鲜明、立体",
+        "system_prompt": "系统提示词，使其更加清晰、有效",
+    }
+)
+_DEFAULT_FIELD_PROMPT = "描述"
+
+_POLISH_DESC_SYS_TMPL = """你是一位专业的剧本杀编剧助手。你的任务是润色NPC的{field_desc}。
+
+请直接返回润色后的内容，不要添加任何解释或前缀。"""
+
+# System prompts are fixed per field, so they are formatted once at import.
+_POLISH_DESC_SYS = MappingProxyType(
+    {
+        field: _POLISH_DESC_SYS_TMPL.format(field_desc=field_desc)
+        for field, field_desc in _FIELD_PROMPTS.items()
+    }
+)
+_DEFAULT_POLISH_DESC_SYS = _POLISH_DESC_SYS_TMPL.format(
+    field_desc=_DEFAULT_FIELD_PROMPT
+)
 
 
 class NPCEnhancer(LLMBase):
     """Enhances NPC descriptions including background and personality."""
 
+    __slots__ = ()
+
     async def polish_description(
         self,
         npc_name: str,
@@ -32,30 +56,11 @@ class NPCEnhancer(LLMBase):
         Returns:
             Polished content
         """
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        field_prompts = {
-            "background": "背景故事，使其更加丰富、有层次感",
-            "personality": "性格描述，使其更加鲜明、立体",
-            "system_prompt": "系统提示词，使其更加清晰、有效",
-        }
-
-        field_desc = field_prompts.get(field, "描述")
-
-        system_prompt = f"""你是一位专业的剧本杀编剧助手。你的任务是润色NPC的{field_desc}。
-
-请直接返回润色后的内容，不要添加任何解释或前缀。"""
-
-        user_prompt = f"""请润色以下NPC的{field_desc}：
-
-NPC名称：{npc_name}
-当前内容：{content}
-"""
-        if context:
-            user_prompt += f"\n故事背景：{context}"
+        config = await self._require_chat_config(llm_config_id)
 
+        system_prompt, user_prompt = self._build_polish_prompts(
+            npc_name, field, content, context
+        )
         result = await self._call_llm_text(config, system_prompt, user_prompt)
         return result.strip()
 
@@ -68,21 +73,21 @@ NPC名称：{npc_name}
         llm_config_id: str | None = None,
     ) -> AsyncGenerator[str, None]:
         """Stream polish NPC description."""
-        config = await self._get_chat_config(llm_config_id)
-        if not config:
-            raise ValueError("No chat LLM configuration available")
-
-        field_prompts = {
-            "background": "背景故事，使其更加丰富、有层次感",
-            "personality": "性格描述，使其更加鲜明、立体",
-            "system_prompt": "系统提示词，使其更加清晰、有效",
-        }
-
-        field_desc = field_prompts.get(field, "描述")
+        config = await self._require_chat_config(llm_config_id)
 
-        system_prompt = f"""你是一位专业的剧本杀编剧助手。你的任务是润色NPC的{field_desc}。
+        system_prompt, user_prompt = self._build_polish_prompts(
+            npc_name, field, content, context
+        )
+        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
+            yield chunk
 
-请直接返回润色后的内容，不要添加任何解释或前缀。"""
+    @staticmethod
+    def _build_polish_prompts(
+        npc_name: str, field: str, content: str, context: str | None
+    ) -> tuple[str, str]:
+        """Build the (system, user) prompts shared by both polish variants."""
+        field_desc = _FIELD_PROMPTS.get(field, _DEFAULT_FIELD_PROMPT)
+        system_prompt = _POLISH_DESC_SYS.get(field, _DEFAULT_POLISH_DESC_SYS)
 
         user_prompt = f"""请润色以下NPC的{field_desc}：
 
@@ -91,6 +96,4 @@ NPC名称：{npc_name}
 """
         if context:
             user_prompt += f"\n故事背景：{context}"
-
-        async for chunk in self._call_llm_stream(config, system_prompt, user_prompt):
-            yield chunk
+        return system_prompt, user_prompt
@@ -8,17 +8,16 @@ Provides AI-powered content enhancement capabilities including:
 - Clue chain analysis
 """
 
-import logging
 from collections.abc import AsyncGenerator
+from functools import cached_property
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .chain_analyzer import ChainAnalyzer
 from .clue_enhancer import ClueEnhancer
+from .llm_base import StreamedText
 from .npc_enhancer import NPCEnhancer
 
-logger = logging.getLogger(__name__)
-
 
 class AIEnhancementService:
     """AI-powered content enhancement service.
@@ -29,9 +28,20 @@ class AIEnhancementService:
     def __init__(self, db: AsyncSession) -> None:
         """Initialize with database session."""
         self.db = db
-        self._clue_enhancer = ClueEnhancer(db)
-        self._npc_enhancer = NPCEnhancer(db)
-        self._chain_analyzer = ChainAnalyzer(db)
+
+    # Enhancers are built on first use; most requests only need one.
+
+    @cached_property
+    def _clue_enhancer(self) -> ClueEnhancer:
+        return ClueEnhancer(self.db)
+
+    @cached_property
+    def _npc_enhancer(self) -> NPCEnhancer:
+        return NPCEnhancer(self.db)
+
+    @cached_property
+    def _chain_analyzer(self) -> ChainAnalyzer:
+        return ChainAnalyzer(self.db)
 
     # ========== Clue Enhancement ==========
 
@@ -60,6 +70,18 @@ class AIEnhancementService:
         ):
             yield chunk
 
+    def polish_clue_detail_iter(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        context: str | None = None,
+        llm_config_id: str | None = None,
+    ) -> StreamedText:
+        """Stream polished clue detail without leading whitespace."""
+        return self._clue_enhancer.polish_detail_iter(
+            clue_name, clue_detail, context, llm_config_id
+        )
+
     async def suggest_trigger_keywords(
         self,
         clue_name: str,
@@ -95,6 +117,64 @@ class AIEnhancementService:
         ):
             yield chunk
 
+    def generate_semantic_summary_iter(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        llm_config_id: str | None = None,
+    ) -> StreamedText:
+        """Stream a semantic summary without leading whitespace."""
+        return self._clue_enhancer.generate_semantic_summary_iter(
+            clue_name, clue_detail, llm_config_id
+        )
+
+    async def enhance_all(
+        self,
+        clue_name: str,
+        clue_detail: str,
+        context: str | None = None,
+        existing_keywords: list[str] | None = None,
+        llm_config_id: str | None = None,
+    ) -> dict:
+        """Polish detail, suggest keywords and summarize a clue concurrently."""
+        return await self._clue_enhancer.enhance_all(
+            clue_name, clue_detail, context, existing_keywords, llm_config_id
+        )
+
+    async def suggest_trigger_keywords_batch(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[list[str] | None]:
+        """Suggest trigger keywords for many clues concurrently."""
+        return await self._clue_enhancer.suggest_trigger_keywords_batch(
+            clues, llm_config_id, max_concurrency
+        )
+
+    async def generate_semantic_summary_batch(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[str | None]:
+        """Generate semantic summaries for many clues concurrently."""
+        return await self._clue_enhancer.generate_semantic_summary_batch(
+            clues, llm_config_id, max_concurrency
+        )
+
+    async def generate_semantic_summaries_with_embeddings(
+        self,
+        clues: list[dict],
+        llm_config_id: str | None = None,
+        embedding_config_id: str | None = None,
+        max_concurrency: int = 10,
+    ) -> list[tuple[str, list[float]] | None]:
+        """Generate semantic summaries for many clues and embed them in one batch."""
+        return await self._clue_enhancer.generate_semantic_summaries_with_embeddings(
+            clues, llm_config_id, embedding_config_id, max_concurrency
+        )
+
     # ========== NPC Enhancement ==========
 
     async def polish_npc_description(
@@ -0,0 +1,85 @@
+"""Graph algorithms shared by clue dependency validation.
+
+All functions operate on plain adjacency mappings (``node -> [neighbor, ...]``)
+so they can be reused by any service that models clue prerequisites, whether
+the edges come from stored clues or from an LLM-generated chain.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+
+Adjacency = Mapping[str, Sequence[str]]
+
+
+def detect_cycles(nodes: Iterable[str], adj: Adjacency) -> list[list[str]]:
+    """
+    Detect cycles in the graph using DFS.
+
+    Returns a list of cycles, where each cycle is a list of node IDs that
+    starts and ends with the same node.
+    """
+    cycles: list[list[str]] = []
+    visited: set[str] = set()
+    rec_stack: set[str] = set()
+    path: list[str] = []
+
+    def dfs(node: str) -> None:
+        visited.add(node)
+        rec_stack.add(node)
+        path.append(node)
+
+        for neighbor in adj.get(node, ()):
+            if neighbor not in visited:
+                dfs(neighbor)
+            elif neighbor in rec_stack:
+                # Found a cycle
+                cycle_start = path.index(neighbor)
+                cycles.append(path[cycle_start:] + [neighbor])
+
+        path.pop()
+        rec_stack.remove(node)
+
+    for node in nodes:
+        if node not in visited:
+            dfs(node)
+
+    return cycles
+
+
+def find_roots(nodes: Iterable[str], radj: Adjacency) -> set[str]:
+    """Find nodes with no incoming edges (no prerequisites)."""
+    return {node for node in nodes if not radj.get(node)}
+
+
+def find_reachable(roots: Iterable[str], adj: Adjacency) -> set[str]:
+    """Find every node reachable from the given roots using BFS."""
+    reachable: set[str] = set()
+    queue = deque(roots)
+
+    while queue:
+        current = queue.popleft()
+        if current in reachable:
+            continue
+        reachable.add(current)
+        queue.extend(n for n in adj.get(current, ()) if n not in reachable)
+
+    return reachable
+
+
+def find_dead(
+    nodes: Iterable[str], adj: Adjacency, roots: set[str]
+) -> list[str]:
+    """
+    Find non-root nodes that are unreachable from any root.
+
+    With no roots at all, every node is reported as dead.
+    """
+    reachable = find_reachable(roots, adj)
+    return [node for node in nodes if node not in roots and node not in reachable]
+
+
+def find_orphans(
+    nodes: Iterable[str], adj: Adjacency, radj: Adjacency
+) -> list[str]:
+    """Find nodes with no relations (neither incoming nor outgoing edges)."""
+    return [node for node in nodes if not radj.get(node) and not adj.get(node)]
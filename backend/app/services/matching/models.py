@@ -5,6 +5,9 @@ from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
 
 from app.models.clue import Clue
+from app.models.llm_config import LLMConfig
+from app.models.npc import NPC
+from app.models.script import Script
 from app.schemas.simulate import (
     ChatOptionsOverride,
     EmbeddingOptionsOverride,
@@ -115,3 +118,15 @@ class NpcResponseResult:
     system_prompt_segments: list[PromptSegment] | None = None
     user_prompt_segments: list[PromptSegment] | None = None
     metrics: LLMMetrics | None = None
+
+
+@dataclass
+class NpcResponseInputs:
+    """Database inputs for an NPC reply, loadable before matching finishes."""
+
+    chat_config: LLMConfig | None = None
+    npc: NPC | None = None
+    script: Script | None = None
+    templates: dict[str, str] = field(default_factory=dict)  # template_id -> content
+    # (player_message, npc_response) pairs, oldest first
+    history: list[tuple[str, str | None]] = field(default_factory=list)
@@ -1,9 +1,13 @@
 """NPC response generation service."""
 
+import asyncio
 import logging
+from collections.abc import Awaitable
+from functools import cached_property
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
 
 from app.config import settings
 from app.models.llm_config import LLMConfig
@@ -15,7 +19,14 @@ from app.schemas.simulate import ChatOptionsOverride
 from app.services.common import LLMClient, LLMConfigManager
 from app.services.template import template_renderer
 
-from .models import LLMMetrics, MatchContext, MatchResult, NpcResponseResult, PromptSegment
+from .models import (
+    LLMMetrics,
+    MatchContext,
+    MatchResult,
+    NpcResponseInputs,
+    NpcResponseResult,
+    PromptSegment,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +38,17 @@ class NpcResponseGenerator:
         """Initialize the generator with a database session."""
         self.db = db
 
+    @cached_property
+    def _sessions(self) -> async_sessionmaker[AsyncSession]:
+        """Factory for short-lived sessions on the request session's engine."""
+        return async_sessionmaker(self.db.bind, expire_on_commit=False)
+
     async def generate(
         self,
         context: MatchContext,
         triggered_clues: list[MatchResult],
         player_message: str,
+        inputs: Awaitable[NpcResponseInputs] | None = None,
     ) -> NpcResponseResult:
         """
         Generate NPC response using LLM with dialogue history.
@@ -40,6 +57,7 @@ class NpcResponseGenerator:
             context: Match context with template and config IDs
             triggered_clues: List of triggered clue results
             player_message: Original player message
+            inputs: Pending result of load_inputs() started by the caller
 
         Returns:
             NpcResponseResult with response and prompt info
@@ -47,21 +65,6 @@ class NpcResponseGenerator:
         try:
             logger.info(f"Generating NPC response for NPC={context.npc_id}")
 
-            # Get chat config
-            chat_config = await self._get_llm_config_by_id(context.npc_chat_config_id)
-            if not chat_config:
-                logger.warning(f"NPC chat config not found: {context.npc_chat_config_id}")
-                return NpcResponseResult()
-
-            logger.info(f"Using chat config: {chat_config.name} ({chat_config.model})")
-
-            # Load NPC and Script data
-            npc = await self._get_npc(context.npc_id)
-            script = await self._get_script(context.script_id)
-            if not npc:
-                logger.warning(f"NPC not found: {context.npc_id}")
-                return NpcResponseResult()
-
             # Determine if we have triggered clues with actual guidance
             has_clue_guidance = False
             clue_guides = []
@@ -77,8 +80,22 @@ class NpcResponseGenerator:
             # Select appropriate template
             template_id = self._select_template(context, has_clue_guidance)
 
-            # Load system template
-            system_template = await self._load_template_content(template_id)
+            # Use prefetched inputs when the caller started loading them early
+            if inputs is None:
+                inputs = self.load_inputs(context)
+            loaded = await inputs
+            chat_config, npc, script = loaded.chat_config, loaded.npc, loaded.script
+            system_template = loaded.templates.get(template_id) if template_id else None
+            history_messages = loaded.history
+            if not chat_config:
+                logger.warning(f"NPC chat config not found: {context.npc_chat_config_id}")
+                return NpcResponseResult()
+
+            logger.info(f"Using chat config: {chat_config.name} ({chat_config.model})")
+
+            if not npc:
+                logger.warning(f"NPC not found: {context.npc_id}")
+                return NpcResponseResult()
 
             # Build template context
             template_context = {
@@ -117,10 +134,6 @@ class NpcResponseGenerator:
             else:
                 system_prompt = f"你是{npc.name}。性格：{npc.personality or '友善'}。背景：{npc.background or '无'}。"
 
-            # Get dialogue history
-            history_messages = await self._get_dialogue_history(
-                context.session_id, limit=settings.dialogue_history_limit
-            )
             logger.debug(
                 f"Loaded {len(history_messages)} history messages for session={context.session_id}"
             )
@@ -128,10 +141,10 @@ class NpcResponseGenerator:
             # Build messages array
             messages = [{"role": "system", "content": system_prompt}]
 
-            for log in history_messages:
-                messages.append({"role": "user", "content": log.player_message})
-                if log.npc_response:
-                    messages.append({"role": "assistant", "content": log.npc_response})
+            for player_turn, npc_turn in history_messages:
+                messages.append({"role": "user", "content": player_turn})
+                if npc_turn:
+                    messages.append({"role": "assistant", "content": npc_turn})
 
             # Build user message with guide instruction
             user_prompt_segments: list[PromptSegment] = []
@@ -185,6 +198,7 @@ class NpcResponseGenerator:
         context: MatchContext,
         triggered_clues: list[MatchResult],
         player_message: str,
+        inputs: Awaitable[NpcResponseInputs] | None = None,
     ):
         """
         Generate NPC response using LLM with streaming.
@@ -193,6 +207,7 @@ class NpcResponseGenerator:
             context: Match context with template and config IDs
             triggered_clues: List of triggered clue results
             player_message: Original player message
+            inputs: Pending result of load_inputs() started by the caller
 
         Yields:
             Tuple of (chunk, final_result) where final_result is None until complete
@@ -201,23 +216,6 @@ class NpcResponseGenerator:
         try:
             logger.info(f"Generating streaming NPC response for NPC={context.npc_id}")
 
-            # Get chat config
-            chat_config = await self._get_llm_config_by_id(context.npc_chat_config_id)
-            if not chat_config:
-                logger.warning(f"NPC chat config not found: {context.npc_chat_config_id}")
-                yield ("", NpcResponseResult())
-                return
-
-            logger.info(f"Using chat config: {chat_config.name} ({chat_config.model})")
-
-            # Load NPC and Script data
-            npc = await self._get_npc(context.npc_id)
-            script = await self._get_script(context.script_id)
-            if not npc:
-                logger.warning(f"NPC not found: {context.npc_id}")
-                yield ("", NpcResponseResult())
-                return
-
             # Determine if we have triggered clues with actual guidance
             has_clue_guidance = False
             clue_guides = []
@@ -230,8 +228,24 @@ class NpcResponseGenerator:
             # Select appropriate template
             template_id = self._select_template(context, has_clue_guidance)
 
-            # Load system template
-            system_template = await self._load_template_content(template_id)
+            # Use prefetched inputs when the caller started loading them early
+            if inputs is None:
+                inputs = self.load_inputs(context)
+            loaded = await inputs
+            chat_config, npc, script = loaded.chat_config, loaded.npc, loaded.script
+            system_template = loaded.templates.get(template_id) if template_id else None
+            history_messages = loaded.history
+            if not chat_config:
+                logger.warning(f"NPC chat config not found: {context.npc_chat_config_id}")
+                yield ("", NpcResponseResult())
+                return
+
+            logger.info(f"Using chat config: {chat_config.name} ({chat_config.model})")
+
+            if not npc:
+                logger.warning(f"NPC not found: {context.npc_id}")
+                yield ("", NpcResponseResult())
+                return
 
             # Build template context
             template_context = {
@@ -269,18 +283,13 @@ class NpcResponseGenerator:
             else:
                 system_prompt = f"你是{npc.name}。性格：{npc.personality or '友善'}。背景：{npc.background or '无'}。"
 
-            # Get dialogue history
-            history_messages = await self._get_dialogue_history(
-                context.session_id, limit=settings.dialogue_history_limit
-            )
-
             # Build messages array
             messages = [{"role": "system", "content": system_prompt}]
 
-            for log in history_messages:
-                messages.append({"role": "user", "content": log.player_message})
-                if log.npc_response:
-                    messages.append({"role": "assistant", "content": log.npc_response})
+            for player_turn, npc_turn in history_messages:
+                messages.append({"role": "user", "content": player_turn})
+                if npc_turn:
+                    messages.append({"role": "assistant", "content": npc_turn})
 
             # Build user message with guide instruction
             user_prompt_segments: list[PromptSegment] = []
@@ -326,16 +335,17 @@ class NpcResponseGenerator:
 
             # Stream LLM response
             logger.info(f"Streaming LLM with {len(messages)} messages")
-            full_response = ""
+            parts: list[str] = []
             usage_info: dict | None = None
             async for chunk, usage in LLMClient.call_stream_with_messages(
                 chat_config, messages, temperature, max_tokens
             ):
                 if chunk:
-                    full_response += chunk
+                    parts.append(chunk)
                     yield (chunk, None)
                 if usage:
                     usage_info = usage
+            full_response = "".join(parts)
 
             logger.info(f"Streaming NPC response completed: {len(full_response)} chars")
 
@@ -388,54 +398,136 @@ class NpcResponseGenerator:
             logger.info("No template configured, using default prompt")
             return None
 
-    async def _get_llm_config_by_id(self, config_id: str | None) -> LLMConfig | None:
+    async def load_inputs(self, context: MatchContext) -> NpcResponseInputs:
+        """
+        Load everything the prompt needs with one concurrent fan-out.
+
+        Both candidate templates are fetched, since which one applies is
+        only known once matching has triggered (or not) clues; callers may
+        therefore start this before matching and pass it to generate().
+
+        An AsyncSession cannot run two statements at once, so each lookup
+        gets its own short-lived session on the same engine; wall time is
+        that of the slowest query rather than the sum of all three.
+        """
+        async def run(lookup, *args):
+            async with self._sessions() as db:
+                return await lookup(db, *args)
+
+        chat_config, (npc, script, templates), history = await asyncio.gather(
+            run(self._get_llm_config_by_id, context.npc_chat_config_id),
+            run(
+                self._load_npc_bundle,
+                context.npc_id,
+                context.script_id,
+                context.npc_clue_template_id,
+                context.npc_no_clue_template_id,
+            ),
+            run(
+                self._get_dialogue_history,
+                context.session_id,
+                settings.dialogue_history_limit,
+            ),
+        )
+        return NpcResponseInputs(
+            chat_config=chat_config,
+            npc=npc,
+            script=script,
+            templates=templates,
+            history=history,
+        )
+
+    @staticmethod
+    async def _get_llm_config_by_id(
+        db: AsyncSession, config_id: str | None
+    ) -> LLMConfig | None:
         """Get LLM config by ID."""
         if not config_id:
             return None
-        return await LLMConfigManager.get_config_by_id(self.db, config_id)
-
-    async def _get_npc(self, npc_id: str) -> NPC | None:
-        """Get NPC by ID."""
-        query = select(NPC).where(NPC.id == npc_id)
-        result = await self.db.execute(query)
-        return result.scalars().first()
-
-    async def _get_script(self, script_id: str) -> Script | None:
-        """Get Script by ID."""
-        query = select(Script).where(
-            Script.id == script_id,
-            Script.deleted_at.is_(None),
-        )
-        result = await self.db.execute(query)
-        return result.scalars().first()
+        return await LLMConfigManager.get_config_by_id(db, config_id)
+
+    @staticmethod
+    async def _load_npc_bundle(
+        db: AsyncSession,
+        npc_id: str,
+        script_id: str,
+        clue_template_id: str | None,
+        no_clue_template_id: str | None,
+    ) -> tuple[NPC | None, Script | None, dict[str, str]]:
+        """
+        Load the NPC, its live script and both reply templates in one query.
 
-    async def _load_template_content(self, template_id: str | None) -> str | None:
-        """Load template content by ID."""
-        if not template_id:
-            return None
-        query = select(PromptTemplate).where(
-            PromptTemplate.id == template_id,
-            PromptTemplate.deleted_at.is_(None),
+        Script and templates are outer-joined on their own ids so a deleted
+        or missing one comes back as None instead of dropping the NPC row.
+
+        Returns:
+            Tuple of (npc, script, template_id -> content for live templates)
+        """
+        clue_tmpl = aliased(PromptTemplate)
+        no_clue_tmpl = aliased(PromptTemplate)
+        query = (
+            select(NPC, Script, clue_tmpl.content, no_clue_tmpl.content)
+            .select_from(NPC)
+            .outerjoin(
+                Script,
+                and_(Script.id == script_id, Script.deleted_at.is_(None)),
+            )
+            .outerjoin(
+                clue_tmpl,
+                and_(
+                    clue_tmpl.id == clue_template_id,
+                    clue_tmpl.deleted_at.is_(None),
+                ),
+            )
+            .outerjoin(
+                no_clue_tmpl,
+                and_(
+                    no_clue_tmpl.id == no_clue_template_id,
+                    no_clue_tmpl.deleted_at.is_(None),
+                ),
+            )
+            .where(NPC.id == npc_id)
         )
-        result = await self.db.execute(query)
-        template = result.scalars().first()
-        return template.content if template else None
+        result = await db.execute(query)
+        row = result.first()
+        if row is None:
+            return None, None, {}
+        npc, script, clue_content, no_clue_content = row
+        templates = {
+            template_id: content
+            for template_id, content in (
+                (clue_template_id, clue_content),
+                (no_clue_template_id, no_clue_content),
+            )
+            if template_id and content is not None
+        }
+        return npc, script, templates
 
+    @staticmethod
     async def _get_dialogue_history(
-        self, session_id: str | None, limit: int = 10
-    ) -> list[DialogueLog]:
-        """Get dialogue history for a session."""
+        db: AsyncSession, session_id: str | None, limit: int = 10
+    ) -> list[tuple[str, str | None]]:
+        """
+        Get the latest ``limit`` turns of a session, oldest first.
+
+        Returns:
+            List of (player_message, npc_response) pairs
+        """
         if not session_id:
             return []
 
+        # Newest first so the (session_id, created_at) covering index can
+        # stop after ``limit`` rows, then flip back to chronological order.
         query = (
-            select(DialogueLog)
+            select(DialogueLog.player_message, DialogueLog.npc_response)
             .where(DialogueLog.session_id == session_id)
-            .order_by(DialogueLog.created_at.asc())
+            .order_by(DialogueLog.created_at.desc())
             .limit(limit)
         )
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        result = await db.execute(query)
+        turns = list(result.tuples())
+        turns.reverse()
+        return turns
 
     async def _call_llm_with_messages(
         self,
@@ -1,9 +1,11 @@
 """Main clue matching service."""
 
+import asyncio
 import logging
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.models.clue import Clue
 from app.schemas.simulate import (
@@ -20,6 +22,7 @@ from .models import (
     LLMMatchPrompts,
     MatchContext,
     MatchResult,
+    NpcResponseInputs,
     NpcResponseResult,
 )
 from .npc_response import NpcResponseGenerator
@@ -27,6 +30,18 @@ from .strategies import EmbeddingStrategy, KeywordStrategy, LLMStrategy
 
 logger = logging.getLogger(__name__)
 
+# Clue columns read while matching and building the NPC reply; ``detail``
+# (often the largest) is only added for embedding, which renders it.
+_MATCHING_COLUMNS = (
+    Clue.id,
+    Clue.npc_id,
+    Clue.name,
+    Clue.type,
+    Clue.detail_for_npc,
+    Clue.trigger_keywords,
+    Clue.trigger_semantic_summary,
+    Clue.prereq_clue_ids,
+)
 
 class MatchingService:
     """
@@ -61,115 +76,108 @@ class MatchingService:
             f"strategy={request.matching_strategy.value}, message='{request.player_message[:50]}...'"
         )
         # Build match context
-        context = MatchContext(
-            player_message=request.player_message.lower(),
-            unlocked_clue_ids=set(request.unlocked_clue_ids),
-            npc_id=request.npc_id,
-            script_id=request.script_id,
-            matching_strategy=request.matching_strategy,
-            template_id=request.template_id,
-            llm_config_id=request.llm_config_id,
-            npc_clue_template_id=request.npc_clue_template_id,
-            npc_no_clue_template_id=request.npc_no_clue_template_id,
-            npc_chat_config_id=request.npc_chat_config_id,
-            session_id=request.session_id,
-            embedding_options_override=request.embedding_options_override,
-            chat_options_override=request.chat_options_override,
-            llm_return_all_scores=request.llm_return_all_scores,
-        )
-
-        # Get all clues for this NPC
-        all_clues = await self._get_candidate_clues(
-            script_id=request.script_id,
-            npc_id=request.npc_id,
-        )
-        logger.debug(f"Found {len(all_clues)} total clues for NPC")
-
-        # Categorize clues by prerequisites
-        eligible_clues, excluded_clues = self._filter_by_prerequisites(
-            all_clues, context
-        )
-        logger.debug(
-            f"After prereq filtering: {len(eligible_clues)} eligible, {len(excluded_clues)} excluded"
-        )
-
-        # Match clues using selected strategy
-        logger.debug(f"Starting {request.matching_strategy.value} matching...")
-        results, strategy_debug = await self._match_with_strategy(
-            eligible_clues, context, request.matching_strategy
-        )
-        logger.debug(f"Matching completed: {len(results)} results")
+        context = self._build_context(request)
+
+        # Start loading NPC reply inputs so the queries overlap clue matching
+        npc_inputs = self._prefetch_npc_inputs(context)
+        try:
+            # Get all clues for this NPC
+            all_clues = await self._get_candidate_clues(
+                script_id=request.script_id,
+                npc_id=request.npc_id,
+                strategy=request.matching_strategy,
+            )
+            logger.debug(f"Found {len(all_clues)} total clues for NPC")
 
-        # Sort by score
-        results.sort(key=lambda r: r.score, reverse=True)
-        if results:
+            # Categorize clues by prerequisites
+            eligible_clues, excluded_clues = self._filter_by_prerequisites(
+                all_clues, context
+            )
             logger.debug(
-                f"Top 3 scores: {[(r.clue.name, f'{r.score:.2f}') for r in results[:3]]}"
+                f"After prereq filtering: {len(eligible_clues)} eligible, {len(excluded_clues)} excluded"
             )
 
-        # Determine threshold
-        threshold = self._get_threshold(context, request.matching_strategy)
-        logger.debug(f"Using threshold: {threshold}")
+            # Match clues using selected strategy
+            logger.debug(f"Starting {request.matching_strategy.value} matching...")
+            results, strategy_debug = await self._match_with_strategy(
+                eligible_clues, context, request.matching_strategy
+            )
+            logger.debug(f"Matching completed: {len(results)} results")
 
-        # Determine triggered clues
-        triggered = self._determine_triggered(
-            results, threshold, request.matching_strategy
-        )
-        logger.debug(f"Triggered {len(triggered)} clues: {[t.clue.name for t in triggered]}")
+            # Sort by score
+            results.sort(key=lambda r: r.score, reverse=True)
+            if results:
+                logger.debug(
+                    f"Top 3 scores: {[(r.clue.name, f'{r.score:.2f}') for r in results[:3]]}"
+                )
 
-        # Build response schemas
-        matched_clues = [self._result_to_schema(r) for r in results]
-        triggered_clues = [self._result_to_schema(r) for r in triggered]
+            # Determine threshold
+            threshold = self._get_threshold(context, request.matching_strategy)
+            logger.debug(f"Using threshold: {threshold}")
 
-        # Build candidate details for debug
-        candidate_details = self._build_candidate_details(
-            eligible_clues, results, strategy_debug
-        )
+            # Determine triggered clues
+            triggered = self._determine_triggered(
+                results, threshold, request.matching_strategy
+            )
+            logger.debug(f"Triggered {len(triggered)} clues: {[t.clue.name for t in triggered]}")
 
-        # Generate NPC response if configured
-        npc_result = await self._maybe_generate_npc_response(
-            context, triggered, request.player_message
-        )
+            # Build response schemas
+            matched_clues = [self._result_to_schema(r) for r in results]
+            triggered_clues = [self._result_to_schema(r) for r in triggered]
 
-        # Build prompt_info for debug
-        prompt_info = None
-        if npc_result.system_prompt or npc_result.user_prompt:
-            prompt_info = {
-                "system_prompt": npc_result.system_prompt,
-                "user_prompt": npc_result.user_prompt,
-                "messages": npc_result.messages,
-                "has_clue": npc_result.has_clue,
-                "system_prompt_segments": [
-                    {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
-                    for seg in npc_result.system_prompt_segments
-                ] if npc_result.system_prompt_segments else None,
-                "user_prompt_segments": [
-                    {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
-                    for seg in npc_result.user_prompt_segments
-                ] if npc_result.user_prompt_segments else None,
-            }
+            # Build candidate details for debug
+            candidate_details = self._build_candidate_details(
+                eligible_clues, results, strategy_debug
+            )
 
-        # Build LLM usage info from metrics
-        llm_usage = self._build_llm_usage_info(strategy_debug, npc_result)
-
-        return SimulateResponse(
-            matched_clues=matched_clues,
-            triggered_clues=triggered_clues,
-            npc_response=npc_result.response,
-            debug_info={
-                "total_clues": len(all_clues),
-                "total_candidates": len(eligible_clues),
-                "total_excluded": len(excluded_clues),
-                "total_matched": len(results),
-                "total_triggered": len(triggered),
-                "threshold": threshold,
-                "strategy": request.matching_strategy.value,
-                "candidates": candidate_details,
-                "excluded": excluded_clues,
-                "prompt_info": prompt_info,
-            },
-            llm_usage=llm_usage,
-        )
+            # Generate NPC response if configured
+            npc_result = await self._maybe_generate_npc_response(
+                context, triggered, request.player_message, npc_inputs
+            )
+
+            # Build prompt_info for debug
+            prompt_info = None
+            if npc_result.system_prompt or npc_result.user_prompt:
+                prompt_info = {
+                    "system_prompt": npc_result.system_prompt,
+                    "user_prompt": npc_result.user_prompt,
+                    "messages": npc_result.messages,
+                    "has_clue": npc_result.has_clue,
+                    "system_prompt_segments": [
+                        {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
+                        for seg in npc_result.system_prompt_segments
+                    ] if npc_result.system_prompt_segments else None,
+                    "user_prompt_segments": [
+                        {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
+                        for seg in npc_result.user_prompt_segments
+                    ] if npc_result.user_prompt_segments else None,
+                }
+
+            # Build LLM usage info from metrics
+            llm_usage = self._build_llm_usage_info(strategy_debug, npc_result)
+
+            return SimulateResponse(
+                matched_clues=matched_clues,
+                triggered_clues=triggered_clues,
+                npc_response=npc_result.response,
+                debug_info={
+                    "total_clues": len(all_clues),
+                    "total_candidates": len(eligible_clues),
+                    "total_excluded": len(excluded_clues),
+                    "total_matched": len(results),
+                    "total_triggered": len(triggered),
+                    "threshold": threshold,
+                    "strategy": request.matching_strategy.value,
+                    "candidates": candidate_details,
+                    "excluded": excluded_clues,
+                    "prompt_info": prompt_info,
+                },
+                llm_usage=llm_usage,
+            )
+        finally:
+            # Never leave the prefetch running once the request is over
+            if npc_inputs and not npc_inputs.done():
+                npc_inputs.cancel()
 
     async def simulate_stream(self, request: SimulateRequest):
         """
@@ -189,7 +197,149 @@ class MatchingService:
         )
 
         # Build match context
-        context = MatchContext(
+        context = self._build_context(request)
+
+        # Start loading NPC reply inputs so the queries overlap clue matching
+        npc_inputs = self._prefetch_npc_inputs(context)
+        try:
+            # Get all clues for this NPC
+            all_clues = await self._get_candidate_clues(
+                script_id=request.script_id,
+                npc_id=request.npc_id,
+                strategy=request.matching_strategy,
+            )
+
+            # Categorize clues by prerequisites
+            eligible_clues, excluded_clues = self._filter_by_prerequisites(
+                all_clues, context
+            )
+
+            # Match clues using selected strategy
+            results, strategy_debug = await self._match_with_strategy(
+                eligible_clues, context, request.matching_strategy
+            )
+
+            # Sort by score
+            results.sort(key=lambda r: r.score, reverse=True)
+
+            # Determine threshold
+            threshold = self._get_threshold(context, request.matching_strategy)
+
+            # Determine triggered clues
+            triggered = self._determine_triggered(
+                results, threshold, request.matching_strategy
+            )
+
+            # Build response schemas
+            matched_clues = [self._result_to_schema(r) for r in results]
+            triggered_clues = [self._result_to_schema(r) for r in triggered]
+
+            # Build candidate details for debug
+            candidate_details = self._build_candidate_details(
+                eligible_clues, results, strategy_debug
+            )
+
+            # Build matching LLM usage info
+            matching_llm_usage = None
+            if isinstance(strategy_debug, LLMMatchPrompts) and strategy_debug.metrics:
+                metrics = strategy_debug.metrics
+                matching_llm_usage = {
+                    "matching_tokens": {
+                        "prompt_tokens": metrics.prompt_tokens,
+                        "completion_tokens": metrics.completion_tokens,
+                        "total_tokens": metrics.total_tokens,
+                    },
+                    "matching_latency_ms": metrics.latency_ms,
+                    "matching_model": metrics.model,
+                }
+
+            # Yield match result first
+            yield {
+                "event": "match_result",
+                "data": {
+                    "matched_clues": [mc.model_dump() for mc in matched_clues],
+                    "triggered_clues": [tc.model_dump() for tc in triggered_clues],
+                    "debug_info": {
+                        "total_clues": len(all_clues),
+                        "total_candidates": len(eligible_clues),
+                        "total_excluded": len(excluded_clues),
+                        "total_matched": len(results),
+                        "total_triggered": len(triggered),
+                        "threshold": threshold,
+                        "strategy": request.matching_strategy.value,
+                        "candidates": candidate_details,
+                        "excluded": excluded_clues,
+                    },
+                    "matching_llm_usage": matching_llm_usage,
+                },
+            }
+
+            # Stream NPC response if configured
+            npc_result = NpcResponseResult()
+            if self._should_generate_npc(context):
+                async for chunk, final_result in self._npc_generator.generate_stream(
+                    context, triggered, request.player_message, npc_inputs
+                ):
+                    if chunk:
+                        yield {"event": "npc_chunk", "data": {"chunk": chunk}}
+                    if final_result:
+                        npc_result = final_result
+
+            # Build prompt_info for debug
+            prompt_info = None
+            if npc_result.system_prompt or npc_result.user_prompt:
+                prompt_info = {
+                    "system_prompt": npc_result.system_prompt,
+                    "user_prompt": npc_result.user_prompt,
+                    "messages": npc_result.messages,
+                    "has_clue": npc_result.has_clue,
+                    "system_prompt_segments": [
+                        {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
+                        for seg in npc_result.system_prompt_segments
+                    ] if npc_result.system_prompt_segments else None,
+                    "user_prompt_segments": [
+                        {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
+                        for seg in npc_result.user_prompt_segments
+                    ] if npc_result.user_prompt_segments else None,
+                }
+
+            # Build NPC LLM usage info
+            npc_llm_usage = None
+            if npc_result.metrics:
+                metrics = npc_result.metrics
+                npc_llm_usage = {
+                    "npc_tokens": {
+                        "prompt_tokens": metrics.prompt_tokens,
+                        "completion_tokens": metrics.completion_tokens,
+                        "total_tokens": metrics.total_tokens,
+                    },
+                    "npc_latency_ms": metrics.latency_ms,
+                    "npc_model": metrics.model,
+                }
+
+            # Yield complete event
+            yield {
+                "event": "complete",
+                "data": {
+                    "npc_response": npc_result.response,
+                    "prompt_info": prompt_info,
+                    "npc_llm_usage": npc_llm_usage,
+                },
+            }
+        finally:
+            # Never leave the prefetch running once the request is over
+            if npc_inputs and not npc_inputs.done():
+                npc_inputs.cancel()
+
+    @staticmethod
+    def _build_context(request: SimulateRequest) -> MatchContext:
+        """
+        Build the match context for a simulate request.
+
+        The message is lowercased and the unlocked ids are hashed into a set
+        here, once per request, so strategies never redo either per clue.
+        """
+        return MatchContext(
             player_message=request.player_message.lower(),
             unlocked_clue_ids=set(request.unlocked_clue_ids),
             npc_id=request.npc_id,
@@ -206,129 +356,17 @@ class MatchingService:
             llm_return_all_scores=request.llm_return_all_scores,
         )
 
-        # Get all clues for this NPC
-        all_clues = await self._get_candidate_clues(
-            script_id=request.script_id,
-            npc_id=request.npc_id,
-        )
-
-        # Categorize clues by prerequisites
-        eligible_clues, excluded_clues = self._filter_by_prerequisites(
-            all_clues, context
-        )
-
-        # Match clues using selected strategy
-        results, strategy_debug = await self._match_with_strategy(
-            eligible_clues, context, request.matching_strategy
-        )
-
-        # Sort by score
-        results.sort(key=lambda r: r.score, reverse=True)
-
-        # Determine threshold
-        threshold = self._get_threshold(context, request.matching_strategy)
-
-        # Determine triggered clues
-        triggered = self._determine_triggered(
-            results, threshold, request.matching_strategy
-        )
-
-        # Build response schemas
-        matched_clues = [self._result_to_schema(r) for r in results]
-        triggered_clues = [self._result_to_schema(r) for r in triggered]
-
-        # Build candidate details for debug
-        candidate_details = self._build_candidate_details(
-            eligible_clues, results, strategy_debug
-        )
-
-        # Build matching LLM usage info
-        matching_llm_usage = None
-        if isinstance(strategy_debug, LLMMatchPrompts) and strategy_debug.metrics:
-            metrics = strategy_debug.metrics
-            matching_llm_usage = {
-                "matching_tokens": {
-                    "prompt_tokens": metrics.prompt_tokens,
-                    "completion_tokens": metrics.completion_tokens,
-                    "total_tokens": metrics.total_tokens,
-                },
-                "matching_latency_ms": metrics.latency_ms,
-                "matching_model": metrics.model,
-            }
-
-        # Yield match result first
-        yield {
-            "event": "match_result",
-            "data": {
-                "matched_clues": [mc.model_dump() for mc in matched_clues],
-                "triggered_clues": [tc.model_dump() for tc in triggered_clues],
-                "debug_info": {
-                    "total_clues": len(all_clues),
-                    "total_candidates": len(eligible_clues),
-                    "total_excluded": len(excluded_clues),
-                    "total_matched": len(results),
-                    "total_triggered": len(triggered),
-                    "threshold": threshold,
-                    "strategy": request.matching_strategy.value,
-                    "candidates": candidate_details,
-                    "excluded": excluded_clues,
-                },
-                "matching_llm_usage": matching_llm_usage,
-            },
-        }
-
-        # Stream NPC response if configured
-        npc_result = NpcResponseResult()
-        if self._should_generate_npc(context):
-            async for chunk, final_result in self._npc_generator.generate_stream(
-                context, triggered, request.player_message
-            ):
-                if chunk:
-                    yield {"event": "npc_chunk", "data": {"chunk": chunk}}
-                if final_result:
-                    npc_result = final_result
-
-        # Build prompt_info for debug
-        prompt_info = None
-        if npc_result.system_prompt or npc_result.user_prompt:
-            prompt_info = {
-                "system_prompt": npc_result.system_prompt,
-                "user_prompt": npc_result.user_prompt,
-                "messages": npc_result.messages,
-                "has_clue": npc_result.has_clue,
-                "system_prompt_segments": [
-                    {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
-                    for seg in npc_result.system_prompt_segments
-                ] if npc_result.system_prompt_segments else None,
-                "user_prompt_segments": [
-                    {"type": seg.type, "content": seg.content, "variable_name": seg.variable_name}
-                    for seg in npc_result.user_prompt_segments
-                ] if npc_result.user_prompt_segments else None,
-            }
-
-        # Build NPC LLM usage info
-        npc_llm_usage = None
-        if npc_result.metrics:
-            metrics = npc_result.metrics
-            npc_llm_usage = {
-                "npc_tokens": {
-                    "prompt_tokens": metrics.prompt_tokens,
-                    "completion_tokens": metrics.completion_tokens,
-                    "total_tokens": metrics.total_tokens,
-                },
-                "npc_latency_ms": metrics.latency_ms,
-                "npc_model": metrics.model,
-            }
-
-        # Yield complete event
-        yield {
-            "event": "complete",
-            "data": {
-                "npc_response": npc_result.response,
-                "prompt_info": prompt_info,
-                "npc_llm_usage": npc_llm_usage,
-            },
-        }
+    def _prefetch_npc_inputs(
+        self, context: MatchContext
+    ) -> asyncio.Task[NpcResponseInputs] | None:
+        """Start loading NPC reply inputs in the background, if a reply is due."""
+        if not self._should_generate_npc(context):
+            return None
+        task = asyncio.create_task(self._npc_generator.load_inputs(context))
+        # Matching may fail before the task is awaited; retrieve its outcome
+        # so an unused failure is not reported as never retrieved.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
 
     def _should_generate_npc(self, context: MatchContext) -> bool:
         """Check if NPC response should be generated."""
@@ -341,10 +379,15 @@ class MatchingService:
         self,
         script_id: str,
         npc_id: str,
+        strategy: MatchingStrategy,
     ) -> list[Clue]:
-        """Get candidate clues for matching."""
+        """Get candidate clues for matching, loading only the columns it reads."""
+        columns = _MATCHING_COLUMNS
+        if strategy == MatchingStrategy.EMBEDDING:
+            columns = (*columns, Clue.detail)
         query = (
             select(Clue)
+            .options(load_only(*columns))
             .where(Clue.script_id == script_id)
             .where(Clue.npc_id == npc_id)
         )
@@ -360,24 +403,23 @@ class MatchingService:
         eligible_clues: list[Clue] = []
         excluded_clues: list[dict] = []
 
+        unlocked = context.unlocked_clue_ids
         for clue in all_clues:
-            prereq_ids = clue.prereq_clue_ids or []
-            if not prereq_ids:
+            prereq_ids = clue.prereq_clue_ids
+            # One C-level subset test; only excluded clues pay for the diff
+            if not prereq_ids or unlocked.issuperset(prereq_ids):
                 eligible_clues.append(clue)
             else:
                 missing_prereqs = [
                     pid for pid in prereq_ids
-                    if pid not in context.unlocked_clue_ids
+                    if pid not in unlocked
                 ]
-                if missing_prereqs:
-                    excluded_clues.append({
-                        "clue_id": clue.id,
-                        "name": clue.name,
-                        "reason": "prerequisites_not_met",
-                        "missing_prereq_ids": missing_prereqs,
-                    })
-                else:
-                    eligible_clues.append(clue)
+                excluded_clues.append({
+                    "clue_id": clue.id,
+                    "name": clue.name,
+                    "reason": "prerequisites_not_met",
+                    "missing_prereq_ids": missing_prereqs,
+                })
 
         return eligible_clues, excluded_clues
 
@@ -512,6 +554,7 @@ class MatchingService:
         context: MatchContext,
         triggered: list[MatchResult],
         player_message: str,
+        npc_inputs: asyncio.Task[NpcResponseInputs] | None = None,
     ) -> NpcResponseResult:
         """Generate NPC response if configured."""
         has_clue_template = context.npc_clue_template_id is not None
@@ -529,6 +572,7 @@ class MatchingService:
                     context=context,
                     triggered_clues=triggered,
                     player_message=player_message,
+                    inputs=npc_inputs,
                 )
             else:
                 logger.warning(
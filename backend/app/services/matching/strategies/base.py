@@ -1,13 +1,32 @@
 """Base strategy for clue matching."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from functools import cached_property
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models.clue import Clue
+from app.models.llm_config import LLMConfig
+from app.models.prompt_template import PromptTemplate
 
 from ..models import MatchContext, MatchResult
 
+# Template ID -> content of the live template
+_TEMPLATE_CONTENTS: TTLCache[str, str] = TTLCache(maxsize=128, ttl=60)
+
+
+@event.listens_for(PromptTemplate, "after_insert")
+@event.listens_for(PromptTemplate, "after_update")
+@event.listens_for(PromptTemplate, "after_delete")
+def _invalidate_template_cache(*_: Any) -> None:
+    """Drop cached template contents whenever any template is written."""
+    _TEMPLATE_CONTENTS.clear()
+
 
 class BaseStrategy(ABC):
     """Abstract base class for matching strategies."""
@@ -16,6 +35,11 @@ class BaseStrategy(ABC):
         """Initialize the strategy with a database session."""
         self.db = db
 
+    @cached_property
+    def _sessions(self) -> async_sessionmaker[AsyncSession]:
+        """Factory for short-lived sessions on the request session's engine."""
+        return async_sessionmaker(self.db.bind, expire_on_commit=False)
+
     @abstractmethod
     async def match(
         self,
@@ -36,8 +60,52 @@ class BaseStrategy(ABC):
 
     def _check_prerequisites(self, clue: Clue, context: MatchContext) -> bool:
         """Check if prerequisite clues are unlocked."""
-        prereq_ids = clue.prereq_clue_ids or []
-        for prereq_id in prereq_ids:
-            if prereq_id not in context.unlocked_clue_ids:
-                return False
-        return True
+        return context.unlocked_clue_ids.issuperset(clue.prereq_clue_ids or ())
+
+    async def _load_config_and_template(
+        self,
+        get_config: Callable[[AsyncSession, str | None], Awaitable[LLMConfig | None]],
+        llm_config_id: str | None,
+        template_id: str | None,
+    ) -> tuple[LLMConfig | None, str | None]:
+        """
+        Resolve the strategy's LLM config and template content together.
+
+        An AsyncSession cannot run two statements at once, so when a
+        template is requested each lookup gets its own short-lived session
+        and the two round-trips overlap instead of running back to back.
+        """
+        if not template_id:
+            return await get_config(self.db, llm_config_id), None
+
+        async def run(lookup, *args):
+            async with self._sessions() as db:
+                return await lookup(db, *args)
+
+        config, template_content = await asyncio.gather(
+            run(get_config, llm_config_id),
+            run(self._get_template_content, template_id),
+        )
+        return config, template_content
+
+    @staticmethod
+    async def _get_template_content(db: AsyncSession, template_id: str) -> str | None:
+        """Load a live template's content by ID, cached for 60 seconds."""
+        content = _TEMPLATE_CONTENTS.get(template_id)
+        if content is None:
+            result = await db.execute(
+                select(PromptTemplate.content).where(
+                    PromptTemplate.id == template_id,
+                    PromptTemplate.deleted_at.is_(None),
+                )
+            )
+            content = result.scalars().first()
+            if content is None:
+                return None
+            _TEMPLATE_CONTENTS[template_id] = content
+        return content
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached template contents."""
+        _TEMPLATE_CONTENTS.clear()
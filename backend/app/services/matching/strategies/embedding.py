@@ -2,12 +2,9 @@
 
 import logging
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.clue import Clue
-from app.models.llm_config import LLMConfig
-from app.models.prompt_template import PromptTemplate
 from app.services.common import LLMConfigManager
 from app.services.template import template_renderer
 from app.services.vector_matching import create_vector_retriever
@@ -44,18 +41,17 @@ class EmbeddingStrategy(BaseStrategy):
         results = []
         rendered_content: EmbeddingRenderedContent | None = None
 
-        # Get embedding config
-        embedding_config = await self._get_llm_config_for_embedding(context.llm_config_id)
+        # Get embedding config and the template, if specified
+        embedding_config, template_content = await self._load_config_and_template(
+            LLMConfigManager.get_embedding_config,
+            context.llm_config_id,
+            context.template_id,
+        )
         if not embedding_config:
             logger.warning("No embedding config found, falling back to keyword matching")
             return await self._keyword_fallback.match(candidates, context)
-
-        # Load template if specified
-        template_content: str | None = None
-        if context.template_id:
-            template_content = await self._load_template_content(context.template_id)
-            if template_content:
-                logger.info(f"Using template {context.template_id} for embedding")
+        if template_content:
+            logger.info(f"Using template {context.template_id} for embedding")
 
         if not candidates:
             return results, None
@@ -89,7 +85,9 @@ class EmbeddingStrategy(BaseStrategy):
 
         try:
             # Build embedding database
-            await retriever.build_embedding_db(candidates, template_content)
+            await retriever.build_embedding_db(
+                candidates, template_content, query=context.player_message
+            )
 
             # Search for matching clues
             vector_results = await retriever.retrieve_clues(
@@ -134,24 +132,6 @@ class EmbeddingStrategy(BaseStrategy):
 
         return results, rendered_content
 
-    async def _get_llm_config_for_embedding(
-        self, llm_config_id: str | None
-    ) -> LLMConfig | None:
-        """Get embedding config - prefer specified ID, otherwise use default."""
-        return await LLMConfigManager.get_embedding_config(self.db, llm_config_id)
-
-    async def _load_template_content(self, template_id: str | None) -> str | None:
-        """Load template content by ID."""
-        if not template_id:
-            return None
-        query = select(PromptTemplate).where(
-            PromptTemplate.id == template_id,
-            PromptTemplate.deleted_at.is_(None),
-        )
-        result = await self.db.execute(query)
-        template = result.scalars().first()
-        return template.content if template else None
-
     def _render_clue_for_embedding(
         self,
         clue: Clue,
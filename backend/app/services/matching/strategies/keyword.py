@@ -28,56 +28,86 @@ class KeywordStrategy(BaseStrategy):
         Returns:
             Tuple of (match results, None - no strategy-specific debug info)
         """
+        # Lowercase every clue's keywords once for both the scan and scoring
+        lowered = [
+            [keyword.lower() for keyword in clue.trigger_keywords or ()]
+            for clue in candidates
+        ]
+        found = self._scan_keywords(lowered, context.player_message)
+        if not found:
+            # Nothing matched anywhere: skip per-clue work entirely
+            return [], None
+
         results = []
-        for clue in candidates:
-            result = self._match_clue(clue, context)
-            if result.score > 0:
+        for clue, clue_lowered in zip(candidates, lowered, strict=True):
+            result = self._match_clue(clue, clue_lowered, found)
+            if result is not None:
                 results.append(result)
         return results, None
 
-    def _match_clue(self, clue: Clue, context: MatchContext) -> MatchResult:
-        """Match a single clue against the context."""
-        result = MatchResult(clue=clue)
+    @staticmethod
+    def _scan_keywords(lowered: list[list[str]], message: str) -> set[str]:
+        """
+        Find which candidate keywords occur in the message.
 
-        # Check keyword matching
-        keyword_score, keyword_matches, keyword_reasons = self._check_keywords(
-            clue.trigger_keywords, context.player_message
-        )
+        Keywords shared by several clues are searched only once, so the
+        message is scanned once per distinct keyword rather than once per
+        keyword per clue. ``message`` is already lowercased by the caller.
+        """
+        distinct = {keyword for keywords in lowered for keyword in keywords}
+        return {keyword for keyword in distinct if keyword in message}
 
-        if keyword_score > 0:
-            result.score = keyword_score
-            result.keyword_matches = keyword_matches
-            result.match_reasons = keyword_reasons
+    def _match_clue(
+        self, clue: Clue, lowered: list[str], found: set[str]
+    ) -> MatchResult | None:
+        """
+        Match a single clue against the keywords found in the message.
 
-        return result
+        Returns:
+            MatchResult for a matching clue, or None (nothing is allocated
+            for the common no-match case)
+        """
+        keyword_score, keyword_matches = self._check_keywords(
+            clue.trigger_keywords, lowered, found
+        )
+        if keyword_score <= 0:
+            return None
+
+        return MatchResult(
+            clue=clue,
+            score=keyword_score,
+            keyword_matches=keyword_matches,
+            match_reasons=[
+                f"Matched {len(keyword_matches)}/{len(lowered)} keywords: "
+                f"{keyword_matches}"
+            ],
+        )
 
     def _check_keywords(
         self,
         trigger_keywords: list[str] | None,
-        message: str,
-    ) -> tuple[float, list[str], list[str]]:
+        lowered: list[str],
+        found: set[str],
+    ) -> tuple[float, list[str]]:
         """
         Check keyword matching and return score.
 
+        Args:
+            trigger_keywords: The clue's keywords as stored
+            lowered: The same keywords, lowercased
+            found: Lowercased keywords known to occur in the message
+
         Returns:
-            Tuple of (score, matched_keywords, reasons)
+            Tuple of (score, matched_keywords); (0.0, []) when none match
         """
-        if not trigger_keywords:
-            return 0.0, [], ["No trigger keywords defined"]
+        if not trigger_keywords or found.isdisjoint(lowered):
+            return 0.0, []
 
-        matches: list[str] = []
-        reasons: list[str] = []
-
-        # Check each keyword
-        for keyword in trigger_keywords:
-            if keyword.lower() in message.lower():
-                matches.append(keyword)
-
-        if not matches:
-            return 0.0, [], ["No keywords matched"]
+        matches = [
+            keyword
+            for keyword, keyword_lower in zip(trigger_keywords, lowered, strict=True)
+            if keyword_lower in found
+        ]
 
         # Calculate score based on match ratio
-        score = len(matches) / len(trigger_keywords)
-        reasons.append(f"Matched {len(matches)}/{len(trigger_keywords)} keywords: {matches}")
-
-        return score, matches, reasons
+        return len(matches) / len(trigger_keywords), matches
@@ -1,15 +1,14 @@
 """LLM-based matching strategy."""
 
-import json
 import logging
 
-from sqlalchemy import select
+import orjson
+from cachetools import LRUCache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.clue import Clue
 from app.models.llm_config import LLMConfig
-from app.models.prompt_template import PromptTemplate
 from app.services.common import LLMClient, LLMConfigManager
 from app.services.template import template_renderer
 
@@ -19,6 +18,54 @@ from .keyword import KeywordStrategy
 
 logger = logging.getLogger(__name__)
 
+# (template content, clue fields shown to the LLM, return_all_scores) ->
+# (system prompt, segments). Keyed by the inputs themselves, so an edited
+# template or clue is simply a miss; a hit skips per-clue JSON encoding and
+# the template render.
+_MATCHING_PROMPTS: LRUCache[tuple, tuple[str, tuple[PromptSegment, ...]]] = (
+    LRUCache(maxsize=128)
+)
+
+
+# Strict structured output, so the reply always parses as LLMMatchResponse
+_MATCH_RESPONSE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "clue_match_response",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "matches": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {
+                                "type": "string",
+                                "description": "The clue ID",
+                            },
+                            "score": {
+                                "type": "number",
+                                "description": "Match confidence score (0.0-1.0)",
+                            },
+                            "reason": {
+                                "type": "string",
+                                "description": "Reason for the match",
+                            },
+                        },
+                        "required": ["id", "score", "reason"],
+                        "additionalProperties": False,
+                    },
+                    "description": "List of matched clues",
+                },
+            },
+            "required": ["matches"],
+            "additionalProperties": False,
+        },
+    },
+}
+
 
 class LLMStrategy(BaseStrategy):
     """LLM-based clue matching strategy."""
@@ -45,8 +92,12 @@ class LLMStrategy(BaseStrategy):
         results = []
         llm_prompts = None
 
-        # Get chat config
-        chat_config = await self._get_llm_config_for_chat(context.llm_config_id)
+        # Get chat config and the matching template, if specified
+        chat_config, template_content = await self._load_config_and_template(
+            LLMConfigManager.get_chat_config,
+            context.llm_config_id,
+            context.template_id,
+        )
         if not chat_config:
             logger.warning("No chat LLM config found, falling back to keyword matching")
             return await self._keyword_fallback.match(candidates, context)
@@ -55,8 +106,8 @@ class LLMStrategy(BaseStrategy):
             return results, None
 
         # Build system prompt with segments
-        system_prompt, system_segments = await self._build_llm_matching_prompt(
-            context.template_id, candidates, context.llm_return_all_scores
+        system_prompt, system_segments = self._build_llm_matching_prompt(
+            template_content, candidates, context.llm_return_all_scores
         )
 
         # Store prompts for debug info
@@ -93,15 +144,15 @@ class LLMStrategy(BaseStrategy):
                 logger.info(f"LLM matching: returning all {len(results)} clues' analysis")
             else:
                 for clue in candidates:
-                    if clue.id in score_reason_map:
-                        score, reason = score_reason_map[clue.id]
-                        if score > 0:
-                            result = MatchResult(
-                                clue=clue,
-                                score=score,
-                                match_reasons=[f"LLM: {reason}"],
-                            )
-                            results.append(result)
+                    # One lookup per candidate; unknown or zero-score ids skip
+                    score, reason = score_reason_map.get(clue.id, (0.0, ""))
+                    if score > 0:
+                        result = MatchResult(
+                            clue=clue,
+                            score=score,
+                            match_reasons=[f"LLM: {reason}"],
+                        )
+                        results.append(result)
                 logger.info(f"LLM matching: returning {len(results)} matched clues")
 
         except Exception as e:
@@ -109,56 +160,61 @@ class LLMStrategy(BaseStrategy):
 
         return results, llm_prompts
 
-    async def _get_llm_config_for_chat(
-        self, llm_config_id: str | None
-    ) -> LLMConfig | None:
-        """Get chat config - prefer specified ID, otherwise use default."""
-        return await LLMConfigManager.get_chat_config(self.db, llm_config_id)
-
-    async def _build_llm_matching_prompt(
+    def _build_llm_matching_prompt(
         self,
-        template_id: str | None,
+        template_content: str | None,
         clues: list[Clue],
         return_all_scores: bool = False,
     ) -> tuple[str, list[PromptSegment]]:
         """Build the system prompt for LLM matching.
 
+        Args:
+            template_content: Matching strategy template, already loaded
+            clues: Candidate clues shown to the LLM
+            return_all_scores: Ask for a score for every clue
+
         Returns:
             Tuple of (prompt string, list of segments for UI rendering)
         """
         segments: list[PromptSegment] = []
 
+        clue_fields = tuple(
+            (
+                clue.id,
+                clue.name,
+                tuple(clue.trigger_keywords or ()),
+                clue.trigger_semantic_summary or "",
+            )
+            for clue in clues
+        )
+        cache_key = (template_content, clue_fields, return_all_scores)
+        cached = _MATCHING_PROMPTS.get(cache_key)
+        if cached is not None:
+            full_prompt, cached_segments = cached
+            return full_prompt, list(cached_segments)
+
         # Build clue list
         clue_list = []
-        for i, clue in enumerate(clues, 1):
+        for i, (clue_id, name, keywords, summary) in enumerate(clue_fields, 1):
             clue_info = {
-                "id": clue.id,
-                "name": clue.name,
-                "trigger_keywords": clue.trigger_keywords or [],
-                "trigger_semantic_summary": clue.trigger_semantic_summary or "",
+                "id": clue_id,
+                "name": name,
+                "trigger_keywords": list(keywords),
+                "trigger_semantic_summary": summary,
             }
-            clue_list.append(f"{i}. {json.dumps(clue_info, ensure_ascii=False)}")
+            clue_list.append(f"{i}. {orjson.dumps(clue_info).decode()}")
 
         clues_text = "\n".join(clue_list)
 
-        # Load matching strategy from template
         matching_strategy = None
         matching_strategy_is_template = False
-        if template_id:
-            query = select(PromptTemplate).where(
-                PromptTemplate.id == template_id,
-                PromptTemplate.deleted_at.is_(None),
+        if template_content is not None:
+            render_result = template_renderer.render(
+                template_content,
+                {"clues": clues_text},
             )
-            result = await self.db.execute(query)
-            template = result.scalars().first()
-
-            if template:
-                render_result = template_renderer.render(
-                    template.content,
-                    {"clues": clues_text},
-                )
-                matching_strategy = render_result.rendered_content
-                matching_strategy_is_template = True
+            matching_strategy = render_result.rendered_content
+            matching_strategy_is_template = True
 
         # Default matching strategy
         if not matching_strategy:
@@ -209,6 +265,7 @@ class LLMStrategy(BaseStrategy):
 ## 输出要求
 {output_requirements}"""
 
+        _MATCHING_PROMPTS[cache_key] = (full_prompt, tuple(segments))
         return full_prompt, segments
 
     async def _call_llm_for_matching(
@@ -219,49 +276,11 @@ class LLMStrategy(BaseStrategy):
         Returns:
             Tuple of (match response, LLM metrics)
         """
-        response_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "clue_match_response",
-                "strict": True,
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "matches": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "id": {
-                                        "type": "string",
-                                        "description": "The clue ID",
-                                    },
-                                    "score": {
-                                        "type": "number",
-                                        "description": "Match confidence score (0.0-1.0)",
-                                    },
-                                    "reason": {
-                                        "type": "string",
-                                        "description": "Reason for the match",
-                                    },
-                                },
-                                "required": ["id", "score", "reason"],
-                                "additionalProperties": False,
-                            },
-                            "description": "List of matched clues",
-                        },
-                    },
-                    "required": ["matches"],
-                    "additionalProperties": False,
-                },
-            },
-        }
-
         llm_response = await LLMClient.call_structured_with_usage(
             config,
             system_prompt,
             user_message,
-            response_schema,
+            _MATCH_RESPONSE_SCHEMA,
             temperature=settings.llm_matching_temperature,
         )
 
@@ -274,5 +293,4 @@ class LLMStrategy(BaseStrategy):
             model=config.model,
         )
 
-        result = json.loads(llm_response.content)
-        return LLMMatchResponse.model_validate(result), metrics
+        return LLMMatchResponse.model_validate_json(llm_response.content), metrics
@@ -12,6 +12,7 @@ from app.schemas.ai_assistant import (
     ClueNode,
     GenerateClueChainRequest,
 )
+from app.services import graph_algo
 
 from .llm_base import LLMBase
 
@@ -207,20 +208,11 @@ Return the improved clue chain."""
             warnings.append(f"{root_count} root clues - may cause information overload")
 
         # Detect cycles using DFS
-        cycles = ClueChainGenerator._detect_cycles(nodes, forward_adj)
+        cycles = graph_algo.detect_cycles((n.temp_id for n in nodes), forward_adj)
         has_cycles = len(cycles) > 0
 
         # Find unreachable clues (BFS from roots)
-        reachable = set()
-        queue = list(root_clues)
-        while queue:
-            current = queue.pop(0)
-            if current in reachable:
-                continue
-            reachable.add(current)
-            queue.extend(forward_adj.get(current, []))
-
-        unreachable = [nid for nid in node_ids if nid not in reachable and nid not in root_clues]
+        unreachable = graph_algo.find_dead(node_ids, forward_adj, set(root_clues))
 
         # Count reasoning paths (simplified)
         high_importance_clues = [n for n in nodes if n.importance == ClueImportance.HIGH]
@@ -238,36 +230,3 @@ Return the improved clue chain."""
             reasoning_path_count=path_count,
             warnings=warnings,
         )
-
-    @staticmethod
-    def _detect_cycles(
-        nodes: list[ClueNode],
-        adj: dict[str, list[str]],
-    ) -> list[list[str]]:
-        """Detect cycles in the graph using DFS."""
-        cycles = []
-        visited = set()
-        rec_stack = set()
-        path = []
-
-        def dfs(node: str) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            for neighbor in adj.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor)
-                elif neighbor in rec_stack:
-                    # Found cycle
-                    cycle_start = path.index(neighbor)
-                    cycles.append(path[cycle_start:] + [neighbor])
-
-            path.pop()
-            rec_stack.remove(node)
-
-        for node in nodes:
-            if node.temp_id not in visited:
-                dfs(node.temp_id)
-
-        return cycles
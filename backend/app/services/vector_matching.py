@@ -1,23 +1,55 @@
-"""Vector-based clue matching service using Chroma backend."""
+"""Vector-based clue matching service with numpy and Chroma backends."""
 
+import hashlib
 import logging
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+from cachetools import LRUCache, TTLCache
 from langchain_openai import OpenAIEmbeddings
 
 from app.models.clue import Clue
 from app.models.llm_config import LLMConfig
+from app.services.common import LLMClient
 from app.services.template import template_renderer
 
 logger = logging.getLogger(__name__)
 
+# (base_url, model, dimensions, player message) -> unit-normalized query
+# embedding. Players often repeat or re-send the same message, and the embedding of a
+# given text never changes, so repeats skip the embedding API call.
+_QUERY_EMBEDDINGS: TTLCache[tuple[str, str, int | None, str], np.ndarray] = TTLCache(
+    maxsize=512, ttl=300
+)
+
+# (base_url, model, dimensions, sha256 of rendered clue content) ->
+# unit-normalized clue embedding. Keyed by the rendered text, so an edited clue or a different
+# template is simply a miss and only changed clues are re-embedded; hashing
+# keeps each key at 32 bytes however long the clue text is.
+_CLUE_EMBEDDINGS: LRUCache[tuple[str, str, int | None, bytes], np.ndarray] = LRUCache(
+    maxsize=4096
+)
+
+# (base_url, model, dimensions, sha256 over the ordered content digests) ->
+# stacked clue matrix. An NPC's eligible clues rarely change between turns, so repeat
+# requests reuse the matrix instead of re-stacking it from per-clue vectors.
+_CLUE_MATRICES: LRUCache[tuple[str, str, int | None, bytes], np.ndarray] = LRUCache(
+    maxsize=64
+)
+
+
+def _content_digest(text: str) -> bytes:
+    """Return the SHA-256 digest used to key cached embeddings of ``text``."""
+    return hashlib.sha256(text.encode()).digest()
+
 
 class VectorBackend(str, Enum):
     """Supported vector storage backends."""
 
+    NUMPY = "numpy"
     CHROMA = "chroma"
 
 
@@ -41,13 +73,15 @@ class BaseVectorClueRetriever(ABC):
         Args:
             embedding_config: LLM config for embedding model.
         """
-        self.embeddings = OpenAIEmbeddings(
-            base_url=embedding_config.base_url,
-            api_key=embedding_config.api_key,
-            model=embedding_config.model,
-        )
         self._clue_map: dict[str, Clue] = {}
-        self._dimensions = (embedding_config.options or {}).get("dimensions", 1536)
+        dimensions = (embedding_config.options or {}).get("dimensions")
+        self._dimensions = dimensions or 1536
+        # Vectors from the same model at different sizes must not mix in caches
+        self._model_key = (
+            embedding_config.base_url,
+            embedding_config.model,
+            dimensions,
+        )
 
     def _render_clue_content(
         self,
@@ -88,8 +122,14 @@ class BaseVectorClueRetriever(ABC):
         self,
         clues: list[Clue],
         template_content: str | None = None,
+        query: str | None = None,
     ) -> None:
-        """Build the embedding database from clues."""
+        """
+        Build the embedding database from clues.
+
+        ``query`` is the message about to be retrieved; backends may embed it
+        in the same request as the clues to save a round-trip.
+        """
         pass
 
     @abstractmethod
@@ -112,6 +152,139 @@ class BaseVectorClueRetriever(ABC):
         pass
 
 
+class NumpyClueRetriever(BaseVectorClueRetriever):
+    """
+    In-process clue retrieval over a numpy embedding matrix.
+
+    Clue embeddings are stacked into one L2-normalized matrix, so a query is
+    scored against every clue with a single matrix-vector product. Scores
+    use the same 1 / (1 + squared L2 distance) scale as the Chroma backend,
+    so similarity thresholds carry over between backends.
+
+    Embeddings are requested through LLMClient: all clues that need one go
+    out as a single batched request on the shared connection pool.
+    """
+
+    def __init__(self, embedding_config: LLMConfig) -> None:
+        """Initialize the numpy retriever."""
+        super().__init__(embedding_config)
+        self._config = embedding_config
+        self._matrix: np.ndarray | None = None
+        self._clue_ids: list[str] = []
+        self._contents: list[str] = []
+
+    async def build_embedding_db(
+        self,
+        clues: list[Clue],
+        template_content: str | None = None,
+        query: str | None = None,
+    ) -> None:
+        """
+        Embed the clues and stack them into a normalized matrix.
+
+        When clues must be embedded and ``query`` is not cached yet, the query
+        rides along in the same embeddings request.
+        """
+        if not clues:
+            return
+
+        for clue in clues:
+            self._contents.append(self._render_clue_content(clue, template_content))
+            self._clue_ids.append(clue.id)
+            self._clue_map[clue.id] = clue
+
+        digests = {content: _content_digest(content) for content in self._contents}
+        order = b"".join(digests[content] for content in self._contents)
+        matrix_key = (*self._model_key, hashlib.sha256(order).digest())
+        self._matrix = _CLUE_MATRICES.get(matrix_key)
+        if self._matrix is not None:
+            logger.info(f"Reused numpy embedding matrix with {len(clues)} clues")
+            return
+
+        vectors: dict[str, np.ndarray] = {}
+        for content, digest in digests.items():
+            vector = _CLUE_EMBEDDINGS.get((*self._model_key, digest))
+            if vector is not None:
+                vectors[content] = vector
+
+        missing = [c for c in digests if c not in vectors]
+        if missing:
+            inputs = missing
+            query_key = (*self._model_key, query)
+            batch_query = query is not None and query_key not in _QUERY_EMBEDDINGS
+            if batch_query and query not in missing:
+                inputs = [*missing, query]
+            embedded = await LLMClient.call_embeddings(self._config, inputs)
+            matrix = np.asarray(embedded, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+            matrix.setflags(write=False)
+            for content, vector in zip(missing, matrix, strict=False):
+                vectors[content] = vector
+                _CLUE_EMBEDDINGS[(*self._model_key, digests[content])] = vector
+            if batch_query:
+                _QUERY_EMBEDDINGS[query_key] = vectors.get(query, matrix[-1])
+
+        self._matrix = np.stack([vectors[content] for content in self._contents])
+        self._matrix.setflags(write=False)
+        _CLUE_MATRICES[matrix_key] = self._matrix
+
+        logger.info(
+            f"Built numpy embedding matrix with {len(clues)} clues "
+            f"({len(missing)} newly embedded)"
+        )
+
+    async def retrieve_clues(
+        self,
+        message: str,
+        k: int = 5,
+        score_threshold: float = 0.0,
+    ) -> list[VectorMatchResult]:
+        """Retrieve the k most similar clues, best first."""
+        if self._matrix is None or k <= 0:
+            return []
+
+        query = await self._embed_query(message)
+        # For unit vectors the squared L2 distance is 2 - 2 * cosine
+        scores = 1.0 / (3.0 - 2.0 * (self._matrix @ query))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            VectorMatchResult(
+                clue_id=self._clue_ids[i],
+                npc_id=self._clue_map[self._clue_ids[i]].npc_id,
+                score=float(scores[i]),
+                content=self._contents[i],
+            )
+            for i in top
+            if scores[i] >= score_threshold
+        ]
+
+    async def _embed_query(self, message: str) -> np.ndarray:
+        """Embed and normalize a player message, reusing recent results."""
+        key = (*self._model_key, message)
+        query = _QUERY_EMBEDDINGS.get(key)
+        if query is None:
+            (embedded,) = await LLMClient.call_embeddings(self._config, [message])
+            query = np.asarray(embedded, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm:
+                query /= norm
+            query.setflags(write=False)
+            _QUERY_EMBEDDINGS[key] = query
+        return query
+
+    async def cleanup(self) -> None:
+        """Release the embedding matrix."""
+        self._matrix = None
+        self._clue_ids.clear()
+        self._contents.clear()
+        self._clue_map.clear()
+
+
 class ChromaClueRetriever(BaseVectorClueRetriever):
     """
     Chroma-based clue retrieval (in-memory).
@@ -123,6 +296,12 @@ class ChromaClueRetriever(BaseVectorClueRetriever):
     def __init__(self, embedding_config: LLMConfig) -> None:
         """Initialize the Chroma retriever."""
         super().__init__(embedding_config)
+        self.embeddings = OpenAIEmbeddings(
+            base_url=embedding_config.base_url,
+            api_key=embedding_config.api_key,
+            model=embedding_config.model,
+            dimensions=(embedding_config.options or {}).get("dimensions"),
+        )
         self._collection_name = f"clues_{uuid.uuid4().hex[:16]}"
         self._vectorstore = None
         logger.debug(f"Created Chroma retriever with collection: {self._collection_name}")
@@ -131,6 +310,7 @@ class ChromaClueRetriever(BaseVectorClueRetriever):
         self,
         clues: list[Clue],
         template_content: str | None = None,
+        query: str | None = None,  # noqa: ARG002 - embedded by Chroma on search
     ) -> None:
         """Build the Chroma embedding database from clues."""
         if not clues:
@@ -222,13 +402,16 @@ def create_vector_retriever(
     Args:
         embedding_config: LLM config for embedding model.
         db: Deprecated, not used. Kept for backwards compatibility.
-        backend: Vector backend to use. Only 'chroma' is supported.
+        backend: Vector backend to use. Defaults to 'numpy'; 'chroma'
+            requires the optional langchain-chroma dependency.
 
     Returns:
-        A Chroma vector retriever instance.
+        A vector retriever instance.
     """
-    logger.info("Using Chroma vector backend")
-    return ChromaClueRetriever(embedding_config)
+    if VectorBackend(backend or VectorBackend.NUMPY) is VectorBackend.CHROMA:
+        logger.info("Using Chroma vector backend")
+        return ChromaClueRetriever(embedding_config)
+    return NumpyClueRetriever(embedding_config)
 
 
 # Backwards compatibility alias
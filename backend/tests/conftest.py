@@ -13,6 +13,8 @@ from sqlalchemy.types import JSON, Text
 
 from app.database import Base, get_db
 from app.main import app
+from app.services.common import LLMConfigManager
+from app.services.matching.strategies import BaseStrategy
 
 
 # Use SQLite for testing
@@ -76,6 +78,18 @@ async def db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture(autouse=True)
+def clear_llm_config_cache() -> None:
+    """Keep cached LLM config lookups from leaking between test databases."""
+    LLMConfigManager.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_strategy_template_cache() -> None:
+    """Keep cached matching templates from leaking between test databases."""
+    BaseStrategy.clear_cache()
+
+
 @pytest.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with database session override."""
@@ -0,0 +1,83 @@
+"""Tests for clue enhancement batch operations."""
+
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.services.common import LLMClient, LLMConfigManager
+from app.services.enhancement import ClueEnhancer
+
+
+def make_config(config_type: LLMConfigType) -> LLMConfig:
+    """Build a transient config (never persisted)."""
+    return LLMConfig(
+        id=f"llm_{config_type.value}",
+        name="test",
+        type=config_type,
+        model="test-model",
+        base_url="http://llm.test/v1",
+        api_key="sk-test",
+        options={},
+    )
+
+
+class TestSummariesWithEmbeddings:
+    """Tests for ClueEnhancer.generate_semantic_summaries_with_embeddings."""
+
+    async def test_embeds_successful_summaries_in_one_call(self, monkeypatch) -> None:
+        async def fake_get_chat_config(db, config_id=None):
+            return make_config(LLMConfigType.CHAT)
+
+        async def fake_get_embedding_config(db, config_id=None):
+            return make_config(LLMConfigType.EMBEDDING)
+
+        async def fake_call_text_batch(config, prompts, max_concurrency=10):
+            return [None if "bad" in user else f" {user[-1]} " for _, user in prompts]
+
+        embed_calls: list[list[str]] = []
+
+        async def fake_call_embeddings(config, inputs):
+            embed_calls.append(inputs)
+            return [[float(ord(text))] for text in inputs]
+
+        monkeypatch.setattr(
+            LLMConfigManager, "get_chat_config", staticmethod(fake_get_chat_config)
+        )
+        monkeypatch.setattr(
+            LLMConfigManager,
+            "get_embedding_config",
+            staticmethod(fake_get_embedding_config),
+        )
+        monkeypatch.setattr(LLMClient, "call_text_batch", fake_call_text_batch)
+        monkeypatch.setattr(LLMClient, "call_embeddings", fake_call_embeddings)
+
+        enhancer = ClueEnhancer(db=None)  # type: ignore[arg-type]
+        results = await enhancer.generate_semantic_summaries_with_embeddings(
+            [
+                {"name": "knife", "detail": "a"},
+                {"name": "bad", "detail": "b"},
+                {"name": "letter", "detail": "c"},
+            ]
+        )
+
+        assert results == [("a", [97.0]), None, ("c", [99.0])]
+        assert embed_calls == [["a", "c"]]
+
+
+class TestPolishDetailIter:
+    """Tests for ClueEnhancer.polish_detail_iter (the SSE endpoint path)."""
+
+    async def test_streams_without_leading_whitespace(self, monkeypatch) -> None:
+        async def fake_get_chat_config(db, config_id=None):
+            return make_config(LLMConfigType.CHAT)
+
+        async def fake_call_stream(config, system_prompt, user_prompt):
+            for chunk in ("\n\n", " The", " knife", " gleams.\n"):
+                yield chunk
+
+        monkeypatch.setattr(
+            LLMConfigManager, "get_chat_config", staticmethod(fake_get_chat_config)
+        )
+        monkeypatch.setattr(LLMClient, "call_stream", fake_call_stream)
+
+        enhancer = ClueEnhancer(db=None)  # type: ignore[arg-type]
+        chunks = [c async for c in enhancer.polish_detail_iter("knife", "detail")]
+
+        assert chunks == ["The", " knife", " gleams.\n"]
@@ -4,6 +4,13 @@ from typing import Any
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clue import Clue
+from app.models.npc import NPC
+from app.models.script import Script
+from app.schemas.clue import ClueTreeEdge, ClueTreeNode
+from app.services.clue_tree import ClueTreeService
 
 
 @pytest.mark.asyncio
@@ -143,3 +150,72 @@ async def test_validate_clue_tree(
     assert "cycles" in data
     assert "dead_clues" in data
     assert "orphan_clues" in data
+
+
+class TestClueTreeService:
+    """Service-level tests for ClueTreeService (no HTTP layer)."""
+
+    @staticmethod
+    async def _seed(db_session: AsyncSession, prereqs: dict[str, list[str]]) -> str:
+        """Create a script, an NPC and one clue per key of ``prereqs``."""
+        script = Script(title="Tree Test")
+        db_session.add(script)
+        await db_session.flush()
+        npc = NPC(script_id=script.id, name="Butler")
+        db_session.add(npc)
+        await db_session.flush()
+        for clue_id, prereq_ids in prereqs.items():
+            db_session.add(
+                Clue(
+                    id=clue_id,
+                    script_id=script.id,
+                    npc_id=npc.id,
+                    name=f"Clue {clue_id}",
+                    detail="detail",
+                    detail_for_npc="hint",
+                    trigger_keywords=[],
+                    prereq_clue_ids=prereq_ids,
+                )
+            )
+        await db_session.flush()
+        return script.id
+
+    async def test_get_clue_tree_node_fields(self, db_session: AsyncSession) -> None:
+        """Nodes built via model_construct expose every schema field."""
+        script_id = await self._seed(
+            db_session, {"clu_a": [], "clu_b": ["clu_a", "clu_missing"]}
+        )
+        tree = await ClueTreeService(db_session).get_clue_tree(script_id)
+
+        assert {n.id for n in tree.nodes} == {"clu_a", "clu_b"}
+        for node in tree.nodes:
+            assert set(node.model_dump()) == set(ClueTreeNode.model_fields)
+            assert node.type == "text"
+        node_b = next(n for n in tree.nodes if n.id == "clu_b")
+        assert node_b.prereq_clue_ids == ["clu_a", "clu_missing"]
+        assert node_b.dependent_clue_ids == []
+
+        # Edges to missing clues are dropped
+        assert [e.model_dump() for e in tree.edges] == [
+            {"source": "clu_a", "target": "clu_b"}
+        ]
+        assert set(tree.edges[0].model_dump()) == set(ClueTreeEdge.model_fields)
+
+    async def test_validate_skips_dead_clues_when_cyclic(
+        self, db_session: AsyncSession
+    ) -> None:
+        """Cyclic trees skip dead-clue analysis unless a detailed report is asked for."""
+        script_id = await self._seed(
+            db_session, {"clu_a": [], "clu_b": ["clu_c"], "clu_c": ["clu_b"]}
+        )
+        service = ClueTreeService(db_session)
+
+        quick = await service.validate_clue_tree(script_id)
+        assert not quick.is_valid
+        assert quick.cycles
+        assert quick.dead_clues == []
+        assert "Cycles present; dead-clue analysis skipped" in quick.warnings
+
+        detailed = await service.validate_clue_tree(script_id, detailed=True)
+        assert not detailed.is_valid
+        assert sorted(detailed.dead_clues) == ["clu_b", "clu_c"]
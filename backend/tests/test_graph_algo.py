@@ -0,0 +1,31 @@
+"""Tests for shared graph algorithms."""
+
+from app.services import graph_algo
+
+
+class TestGraphAlgo:
+    """Tests for cycle, root, dead and orphan detection."""
+
+    def test_detect_cycles(self) -> None:
+        adj = {"a": ["b"], "b": ["c"], "c": ["a"], "d": []}
+        cycles = graph_algo.detect_cycles(["a", "b", "c", "d"], adj)
+        assert cycles == [["a", "b", "c", "a"]]
+
+    def test_no_cycles(self) -> None:
+        adj = {"a": ["b", "c"], "b": ["c"]}
+        assert graph_algo.detect_cycles(["a", "b", "c"], adj) == []
+
+    def test_roots_dead_orphans(self) -> None:
+        nodes = ["root", "child", "island", "loop1", "loop2"]
+        adj = {"root": ["child"], "loop1": ["loop2"], "loop2": ["loop1"]}
+        radj = {"child": ["root"], "loop1": ["loop2"], "loop2": ["loop1"]}
+
+        roots = graph_algo.find_roots(nodes, radj)
+        assert roots == {"root", "island"}
+        assert graph_algo.find_dead(nodes, adj, roots) == ["loop1", "loop2"]
+        assert graph_algo.find_orphans(nodes, adj, radj) == ["island"]
+
+    def test_no_roots_all_dead(self) -> None:
+        nodes = ["a", "b"]
+        adj = {"a": ["b"], "b": ["a"]}
+        assert graph_algo.find_dead(nodes, adj, set()) == ["a", "b"]
@@ -0,0 +1,53 @@
+"""Tests for the keyword matching strategy."""
+
+from app.models.clue import Clue
+from app.services.matching import KeywordStrategy
+from app.services.matching.models import MatchContext
+
+
+def make_clue(clue_id: str, keywords: list[str] | None) -> Clue:
+    """Build a transient clue with the given trigger keywords."""
+    return Clue(id=clue_id, npc_id="npc_1", name=clue_id, trigger_keywords=keywords)
+
+
+def make_context(message: str) -> MatchContext:
+    """Build a context the way MatchingService does (lowercased message)."""
+    return MatchContext(
+        player_message=message.lower(),
+        unlocked_clue_ids=set(),
+        npc_id="npc_1",
+        script_id="script_1",
+    )
+
+
+class TestKeywordStrategy:
+    """Tests for KeywordStrategy.match."""
+
+    async def test_scores_by_matched_ratio(self) -> None:
+        strategy = KeywordStrategy(db=None)  # type: ignore[arg-type]
+        clues = [
+            make_clue("c_knife", ["Knife", "blood", "kitchen"]),
+            make_clue("c_letter", ["letter"]),
+            make_clue("c_shared", ["kitchen", "KNIFE"]),
+            make_clue("c_none", None),
+        ]
+        results, debug = await strategy.match(
+            clues, make_context("I saw a knife in the Kitchen")
+        )
+
+        assert debug is None
+        assert [r.clue.id for r in results] == ["c_knife", "c_shared"]
+        assert results[0].score == 2 / 3
+        assert results[0].keyword_matches == ["Knife", "kitchen"]
+        assert results[0].match_reasons == [
+            "Matched 2/3 keywords: ['Knife', 'kitchen']"
+        ]
+        assert results[1].score == 1.0
+        assert results[1].keyword_matches == ["kitchen", "KNIFE"]
+
+    async def test_no_match(self) -> None:
+        strategy = KeywordStrategy(db=None)  # type: ignore[arg-type]
+        results, _ = await strategy.match(
+            [make_clue("c_letter", ["letter"])], make_context("hello")
+        )
+        assert results == []
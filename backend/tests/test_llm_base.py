@@ -0,0 +1,348 @@
+"""Tests for enhancement LLM base utilities."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Iterator
+
+import pytest
+
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.services.common import LLMClient, LLMConfigManager
+from app.services.enhancement.llm_base import (
+    ExactCache,
+    LLMBase,
+    SemanticCache,
+    StreamedText,
+    exact_cache,
+    semantic_cache,
+)
+
+
+def make_config(**options: object) -> LLMConfig:
+    """Build a transient chat config (never persisted)."""
+    return LLMConfig(
+        id="llm_test",
+        name="test",
+        type=LLMConfigType.CHAT,
+        model="test-model",
+        base_url="http://llm.test/v1",
+        api_key="sk-test",
+        options=dict(options),
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_exact_cache() -> Iterator[None]:
+    """Isolate the module-level response caches between tests."""
+    exact_cache.clear()
+    semantic_cache.clear()
+    yield
+    exact_cache.clear()
+    semantic_cache.clear()
+
+
+class TestSemanticCache:
+    """Tests for the in-memory semantic response cache."""
+
+    def test_returns_response_above_threshold(self) -> None:
+        cache = SemanticCache()
+        cache.put("gpt", [1.0, 0.0], "first")
+        cache.put("gpt", [0.0, 1.0], "second")
+
+        assert cache.get("gpt", [0.99, 0.05], 0.95) == "first"
+        assert cache.get("gpt", [1.0, 1.0], 0.95) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_partitioned_by_model(self) -> None:
+        cache = SemanticCache()
+        cache.put("gpt", [1.0, 0.0], "first")
+
+        assert cache.get("other", [1.0, 0.0], 0.9) is None
+
+    def test_vector_size_mismatch_is_a_miss(self) -> None:
+        cache = SemanticCache()
+        cache.put("m", [1.0, 0.0, 0.0], "three")
+
+        assert cache.get("m", [1.0, 0.0], 0.9) is None
+        cache.put("m", [1.0, 0.0], "two")
+        assert cache.get("m", [1.0, 0.0], 0.9) == "two"
+
+    def test_partition_covers_embedding_space(self) -> None:
+        chat = make_config()
+        embedding = make_config(dimensions=256)
+        key = SemanticCache.partition(chat, embedding, "sys")
+
+        assert key[:4] == ("test-model", "http://llm.test/v1", "test-model", 256)
+        assert key != SemanticCache.partition(chat, make_config(dimensions=512), "sys")
+        assert key != SemanticCache.partition(chat, embedding, "other sys")
+
+    def test_evicts_oldest(self) -> None:
+        cache = SemanticCache(max_entries=2)
+        cache.put("gpt", [1.0, 0.0, 0.0], "a")
+        cache.put("gpt", [0.0, 1.0, 0.0], "b")
+        cache.put("gpt", [0.0, 0.0, 1.0], "c")
+
+        assert cache.get("gpt", [1.0, 0.0, 0.0], 0.9) is None
+        assert cache.get("gpt", [0.0, 0.0, 1.0], 0.9) == "c"
+
+
+class TestLLMBaseSemanticCache:
+    """Tests for semantic caching in LLMBase._call_llm_text."""
+
+    async def test_new_embedding_space_does_not_reuse_responses(
+        self, monkeypatch
+    ) -> None:
+        embedding = make_config(dimensions=3)
+        calls: list[str] = []
+
+        async def fake_get_embedding_config(db, config_id=None):
+            return embedding
+
+        async def fake_call_embeddings(config, inputs):
+            return [[1.0] + [0.0] * (config.options["dimensions"] - 1)]
+
+        async def fake_call_text(config, system_prompt, user_prompt):
+            calls.append(user_prompt)
+            return f"reply {len(calls)}"
+
+        monkeypatch.setattr(
+            LLMConfigManager,
+            "get_embedding_config",
+            staticmethod(fake_get_embedding_config),
+        )
+        monkeypatch.setattr(LLMClient, "call_embeddings", fake_call_embeddings)
+        monkeypatch.setattr(LLMClient, "call_text", fake_call_text)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(semantic_cache_threshold=0.9)
+
+        assert await base._call_llm_text(config, "sys", "user") == "reply 1"
+        assert await base._call_llm_text(config, "sys", "user") == "reply 1"
+        # A later request on a resized embedding model must not compare
+        # against the old vectors
+        embedding = make_config(dimensions=2)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        assert await base._call_llm_text(config, "sys", "user") == "reply 2"
+
+    async def test_other_system_prompt_does_not_reuse_responses(
+        self, monkeypatch
+    ) -> None:
+        async def fake_get_embedding_config(db, config_id=None):
+            return make_config()
+
+        async def fake_call_embeddings(config, inputs):
+            return [[1.0, 0.0]]
+
+        async def fake_call_text(config, system_prompt, user_prompt):
+            return system_prompt
+
+        monkeypatch.setattr(
+            LLMConfigManager,
+            "get_embedding_config",
+            staticmethod(fake_get_embedding_config),
+        )
+        monkeypatch.setattr(LLMClient, "call_embeddings", fake_call_embeddings)
+        monkeypatch.setattr(LLMClient, "call_text", fake_call_text)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(semantic_cache_threshold=0.9)
+
+        assert await base._call_llm_text(config, "polish", "clue") == "polish"
+        assert await base._call_llm_text(config, "summary", "clue") == "summary"
+        assert await base._call_llm_text(config, "polish", "clue") == "polish"
+        assert semantic_cache.hits == 1
+
+    async def test_malformed_embedding_response_skips_cache(self, monkeypatch) -> None:
+        async def fake_get_embedding_config(db, config_id=None):
+            return make_config()
+
+        async def no_vectors(config, inputs):
+            return []
+
+        async def fake_call_text(config, system_prompt, user_prompt):
+            return "reply"
+
+        monkeypatch.setattr(
+            LLMConfigManager,
+            "get_embedding_config",
+            staticmethod(fake_get_embedding_config),
+        )
+        monkeypatch.setattr(LLMClient, "call_embeddings", no_vectors)
+        monkeypatch.setattr(LLMClient, "call_text", fake_call_text)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(semantic_cache_threshold=0.9)
+
+        assert await base._call_llm_text(config, "sys", "user") == "reply"
+
+    async def test_batch_resolves_embedding_config_once(self, monkeypatch) -> None:
+        lookups = 0
+
+        async def fake_get_chat_config(db, config_id=None):
+            return make_config(semantic_cache_threshold=0.9)
+
+        async def missing_embedding_config(db, config_id=None):
+            nonlocal lookups
+            lookups += 1
+            return None
+
+        async def fake_call_text(config, system_prompt, user_prompt):
+            await asyncio.sleep(0)
+            return user_prompt
+
+        monkeypatch.setattr(
+            LLMConfigManager, "get_chat_config", staticmethod(fake_get_chat_config)
+        )
+        monkeypatch.setattr(
+            LLMConfigManager,
+            "get_embedding_config",
+            staticmethod(missing_embedding_config),
+        )
+        monkeypatch.setattr(LLMClient, "call_text", fake_call_text)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+
+        config = await base._get_batch_chat_config()
+        results = await base._gather_bounded(
+            (base._call_llm_text(config, "sys", str(i)) for i in range(5)), 5
+        )
+
+        assert results == ["0", "1", "2", "3", "4"]
+        # The miss is remembered: no worker queries through the shared session
+        assert lookups == 1
+
+
+class TestExactCache:
+    """Tests for the exact-match response cache."""
+
+    def test_expired_entries_are_dropped(self) -> None:
+        cache = ExactCache()
+        cache.set("live", "a", ttl=60)
+        cache.set("dead", "b", ttl=-1)
+
+        assert cache.get("live") == "a"
+        assert cache.get("dead") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ExactCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_key_depends_on_kind_and_prompts(self) -> None:
+        key = ExactCache.key("text", "m", "sys", "user")
+        assert key == ExactCache.key("text", "m", "sys", "user")
+        assert key != ExactCache.key("json", "m", "sys", "user")
+        assert key != ExactCache.key("text", "m", "sys", "user2")
+
+
+class TestLLMBaseResponseCache:
+    """Tests for response caching in LLMBase helpers."""
+
+    async def test_text_reused_when_enabled(self, monkeypatch) -> None:
+        calls: list[str] = []
+
+        async def fake_call_text(config, system_prompt, user_prompt):
+            calls.append(user_prompt)
+            return f"reply {len(calls)}"
+
+        monkeypatch.setattr(LLMClient, "call_text", fake_call_text)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(response_cache_ttl=60)
+
+        assert await base._call_llm_text(config, "sys", "user") == "reply 1"
+        assert await base._call_llm_text(config, "sys", "user") == "reply 1"
+        assert await base._call_llm_text(config, "sys", "other") == "reply 2"
+        assert await base._call_llm_text(make_config(), "sys", "user") == "reply 3"
+
+    async def test_json_hits_are_independent_copies(self, monkeypatch) -> None:
+        async def fake_call_json(config, system_prompt, user_prompt):
+            return {"keywords": ["knife"]}
+
+        monkeypatch.setattr(LLMClient, "call_json", fake_call_json)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(response_cache_ttl=60)
+
+        first = await base._call_llm_json(config, "sys", "user")
+        first["keywords"].append("mutated")
+        second = await base._call_llm_json(config, "sys", "user")
+        assert second == {"keywords": ["knife"]}
+
+    async def test_structured_keyed_by_schema(self, monkeypatch) -> None:
+        calls: list[str] = []
+
+        async def fake_call_structured(config, system_prompt, user_prompt, schema):
+            calls.append(schema["json_schema"]["name"])
+            return {"n": len(calls)}
+
+        monkeypatch.setattr(LLMClient, "call_structured", fake_call_structured)
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+        config = make_config(response_cache_ttl=60)
+        first = {"json_schema": {"name": "first"}}
+        second = {"json_schema": {"name": "second"}}
+
+        assert await base._call_llm_structured(config, "s", "u", first) == {"n": 1}
+        assert await base._call_llm_structured(config, "s", "u", first) == {"n": 1}
+        assert await base._call_llm_structured(config, "s", "u", second) == {"n": 2}
+        assert calls == ["first", "second"]
+
+
+class TestLLMBaseConfigCache:
+    """Tests for per-instance chat config memoization."""
+
+    async def test_resolves_each_id_once(self, monkeypatch) -> None:
+        lookups: list[str | None] = []
+
+        async def fake_get_chat_config(db, config_id=None):
+            lookups.append(config_id)
+            return None if config_id == "missing" else make_config()
+
+        monkeypatch.setattr(
+            LLMConfigManager, "get_chat_config", staticmethod(fake_get_chat_config)
+        )
+        base = LLMBase(db=None)  # type: ignore[arg-type]
+
+        first = await base._get_chat_config("llm_test")
+        assert await base._get_chat_config("llm_test") is first
+        assert await base._get_chat_config("missing") is None
+        assert await base._get_chat_config("missing") is None
+        assert lookups == ["llm_test", "missing", "missing"]
+
+
+async def chunks_of(*chunks: str) -> AsyncGenerator[str, None]:
+    """Yield the given chunks as an async stream."""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestStreamedText:
+    """Tests for the stream wrapper used by the *_iter enhancers."""
+
+    async def test_drops_only_leading_whitespace(self) -> None:
+        stream = StreamedText(chunks_of("\n", "  Hel", "lo", " world \n"))
+        assert [c async for c in stream] == ["Hel", "lo", " world \n"]
+
+    async def test_whitespace_only_response_yields_nothing(self) -> None:
+        stream = StreamedText(chunks_of(" ", "\n"))
+        assert [c async for c in stream] == []
+
+
+class TestGatherBounded:
+    """Tests for LLMBase._gather_bounded."""
+
+    async def test_order_failures_and_concurrency(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def call(i: int) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if i == 2:
+                raise ValueError("bad clue")
+            return i * 10
+
+        results = await LLMBase._gather_bounded((call(i) for i in range(5)), 2)
+        assert results == [0, 10, None, 30, 40]
+        assert peak == 2
@@ -0,0 +1,391 @@
+"""Tests for the shared LLM client."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Callable
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.services.common import LLMClient
+from app.services.common.llm_client import _BUF_POOL
+
+
+def make_config(**options: object) -> LLMConfig:
+    """Build a transient chat config (never persisted)."""
+    return LLMConfig(
+        id="llm_test",
+        name="test",
+        type=LLMConfigType.CHAT,
+        model="test-model",
+        base_url="http://llm.test/v1",
+        api_key="sk-test",
+        options=dict(options),
+    )
+
+
+def chat_completion(content: str) -> dict:
+    """Build a minimal OpenAI-style chat completion payload."""
+    return {"choices": [{"message": {"content": content}}]}
+
+
+@pytest.fixture
+async def mock_llm() -> AsyncGenerator[Callable[..., list[dict]], None]:
+    """Route LLMClient traffic to an in-process handler.
+
+    Yields a function that installs a handler and returns the list the
+    decoded request bodies are recorded into.
+    """
+
+    def install(handler: Callable[[httpx.Request], httpx.Response]) -> list[dict]:
+        requests: list[dict] = []
+
+        def recording_handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return handler(request)
+
+        transport = httpx.MockTransport(recording_handler)
+        LLMClient._client = httpx.AsyncClient(transport=transport)
+        return requests
+
+    yield install
+    await LLMClient.close()
+
+
+class TestCallJson:
+    """Tests for LLMClient.call_json."""
+
+    async def test_plain_json(self, mock_llm) -> None:
+        requests = mock_llm(
+            lambda _: httpx.Response(200, json=chat_completion('{"a": 1}'))
+        )
+        result = await LLMClient.call_json(make_config(), "sys", "user")
+        assert result == {"a": 1}
+        assert requests[0]["messages"][1] == {"role": "user", "content": "user"}
+
+    async def test_fenced_json(self, mock_llm) -> None:
+        content = 'Here you go:\n```json\n{"keywords": ["knife"]}\n```\nDone.'
+        mock_llm(lambda _: httpx.Response(200, json=chat_completion(content)))
+        result = await LLMClient.call_json(make_config(), "sys", "user")
+        assert result == {"keywords": ["knife"]}
+
+    async def test_untagged_fence(self, mock_llm) -> None:
+        content = '```\n{"ok": true}\n```'
+        mock_llm(lambda _: httpx.Response(200, json=chat_completion(content)))
+        result = await LLMClient.call_json(make_config(), "sys", "user")
+        assert result == {"ok": True}
+
+    async def test_unparseable_raises(self, mock_llm) -> None:
+        mock_llm(lambda _: httpx.Response(200, json=chat_completion("no json here")))
+        with pytest.raises(ValueError):
+            await LLMClient.call_json(make_config(), "sys", "user")
+
+    async def test_json_mode_when_supported(self, mock_llm) -> None:
+        requests = mock_llm(
+            lambda _: httpx.Response(200, json=chat_completion('{"a": 1}'))
+        )
+        result = await LLMClient.call_json(
+            make_config(supports_json_mode=True), "sys", "user"
+        )
+        assert result == {"a": 1}
+        assert requests[0]["response_format"] == {"type": "json_object"}
+
+
+def sse_response(
+    events: list[str], chunk_size: int = 7, sep: str = "\n\n"
+) -> httpx.Response:
+    """Build a streaming SSE response split into small, misaligned chunks."""
+    body = "".join(f"data: {event}{sep}" for event in events).encode()
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    return httpx.Response(
+        200,
+        headers={"content-type": "text/event-stream"},
+        stream=_ChunkStream(chunks),
+    )
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    """Async byte stream yielding pre-split chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def delta(content: str) -> str:
+    """Build one streamed chat-completion delta event."""
+    return json.dumps(
+        {"choices": [{"delta": {"content": content}}]}, ensure_ascii=False
+    )
+
+
+class TestCallStream:
+    """Tests for LLMClient.call_stream."""
+
+    async def test_yields_content_until_done(self, mock_llm) -> None:
+        events = [delta("你好"), delta(""), delta(", world"), "[DONE]", delta("x")]
+        mock_llm(lambda _: sse_response(events))
+        chunks = [c async for c in LLMClient.call_stream(make_config(), "s", "u")]
+        assert chunks == ["你好", ", world"]
+
+    async def test_skips_malformed_events(self, mock_llm) -> None:
+        events = [delta("a"), "{not json", delta("b"), "[DONE]"]
+        mock_llm(lambda _: sse_response(events, chunk_size=3))
+        chunks = [c async for c in LLMClient.call_stream(make_config(), "s", "u")]
+        assert chunks == ["a", "b"]
+
+    async def test_yields_unterminated_last_line(self, mock_llm) -> None:
+        body = f"data: {delta('a')}\n\ndata: {delta('b')}\r".encode()
+        mock_llm(
+            lambda _: httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=_ChunkStream([body[:9], body[9:]]),
+            )
+        )
+        chunks = [c async for c in LLMClient.call_stream(make_config(), "s", "u")]
+        assert chunks == ["a", "b"]
+
+    async def test_line_buffer_returned_to_pool(self, mock_llm) -> None:
+        mock_llm(lambda _: sse_response([delta("a"), "[DONE]"]))
+        _BUF_POOL.clear()
+        chunks = [c async for c in LLMClient.call_stream(make_config(), "s", "u")]
+        assert chunks == ["a"]
+        assert len(_BUF_POOL) == 1
+        assert _BUF_POOL[0] == b""
+
+    async def test_batches_deltas_by_size(self, mock_llm) -> None:
+        events = [delta(c) for c in "abcdefg"] + ["[DONE]"]
+        mock_llm(lambda _: sse_response(events))
+        chunks = [
+            c
+            async for c in LLMClient.call_stream(make_config(), "s", "u", chunk_size=3)
+        ]
+        assert chunks == ["abc", "def", "g"]
+
+    async def test_early_close_stops_reader(self, mock_llm) -> None:
+        events = [delta(str(i)) for i in range(100)] + ["[DONE]"]
+        mock_llm(lambda _: sse_response(events))
+        stream = LLMClient.call_stream(make_config(), "s", "u")
+        assert await anext(stream) == "0"
+        await stream.aclose()
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert pending == []
+
+
+class TestCallStreamWithMessages:
+    """Tests for LLMClient.call_stream_with_messages."""
+
+    async def test_yields_content_then_usage(self, mock_llm) -> None:
+        usage = json.dumps(
+            {
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": 3,
+                    "completion_tokens": 2,
+                    "total_tokens": 5,
+                },
+            }
+        )
+        events = [delta("Hel"), delta("lo"), usage, "[DONE]"]
+        mock_llm(lambda _: sse_response(events, chunk_size=5, sep="\r\n"))
+        messages = [{"role": "user", "content": "hi"}]
+        results = [
+            r
+            async for r in LLMClient.call_stream_with_messages(make_config(), messages)
+        ]
+        assert [chunk for chunk, _ in results[:-1]] == ["Hel", "lo"]
+        final_chunk, final_usage = results[-1]
+        assert final_chunk == ""
+        assert final_usage["total_tokens"] == 5
+        assert final_usage["model"] == "test-model"
+        assert "latency_ms" in final_usage
+
+    async def test_usage_not_requested(self, mock_llm) -> None:
+        requests = mock_llm(lambda _: sse_response([delta("hi"), "[DONE]"]))
+        messages = [{"role": "user", "content": "hi"}]
+        results = [
+            r
+            async for r in LLMClient.call_stream_with_messages(
+                make_config(), messages, include_usage=False
+            )
+        ]
+        assert "stream_options" not in requests[0]
+        assert results[0] == ("hi", None)
+        assert set(results[-1][1]) == {"latency_ms", "model"}
+
+    async def test_http_error_reaches_consumer(self, mock_llm) -> None:
+        mock_llm(lambda _: httpx.Response(500))
+        messages = [{"role": "user", "content": "hi"}]
+        with pytest.raises(httpx.HTTPStatusError):
+            async for _ in LLMClient.call_stream_with_messages(make_config(), messages):
+                pass
+
+    async def test_early_close_stops_reader(self, mock_llm) -> None:
+        events = [delta(str(i)) for i in range(100)] + ["[DONE]"]
+        mock_llm(lambda _: sse_response(events))
+        messages = [{"role": "user", "content": "hi"}]
+        stream = LLMClient.call_stream_with_messages(make_config(), messages)
+        first, _ = await anext(stream)
+        await stream.aclose()
+        assert first == "0"
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert pending == []
+
+
+class TestEndpointCache:
+    """Tests for per-config endpoint memoization."""
+
+    def test_reuses_endpoint_for_same_credentials(self) -> None:
+        first = LLMClient._endpoint(make_config())
+        second = LLMClient._endpoint(make_config())
+        assert first is second
+        assert first[0] == "http://llm.test/v1/chat/completions"
+        assert first[1] == {
+            "Authorization": "Bearer sk-test",
+            "Content-Type": "application/json",
+        }
+
+    def test_key_change_gets_new_headers(self) -> None:
+        config = make_config()
+        config.api_key = "sk-rotated"
+        _, headers = LLMClient._endpoint(config)
+        assert headers["Authorization"] == "Bearer sk-rotated"
+
+    def test_cache_is_bounded(self) -> None:
+        for i in range(LLMClient._endpoint_cache.maxsize + 5):
+            config = make_config()
+            config.api_key = f"sk-{i}"
+            LLMClient._endpoint(config)
+        assert len(LLMClient._endpoint_cache) == LLMClient._endpoint_cache.maxsize
+
+    def test_headers_are_read_only(self) -> None:
+        _, headers = LLMClient._endpoint(make_config())
+        with pytest.raises(TypeError):
+            headers["Authorization"] = "Bearer other"  # type: ignore[index]
+
+
+class TestSharedClient:
+    """Tests for the single pooled HTTP client."""
+
+    async def test_call_kinds_share_one_pool(self, monkeypatch) -> None:
+        timeouts: list[float] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"]["read"])
+            if json.loads(request.content).get("stream"):
+                return sse_response([delta("x"), "[DONE]"])
+            return httpx.Response(200, json=chat_completion('{"a": 1}'))
+
+        client = httpx.AsyncClient(
+            timeout=settings.llm_timeout, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(LLMClient, "_client", client)
+        config = make_config()
+        await LLMClient.call_text(config, "s", "u")
+        await LLMClient.call_json_mode(config, "s", "u")
+        assert [c async for c in LLMClient.call_stream(config, "s", "u")] == ["x"]
+        assert await LLMClient.get_client() is client
+        assert timeouts == [
+            settings.llm_timeout,
+            settings.llm_long_timeout,
+            settings.llm_stream_timeout,
+        ]
+        await client.aclose()
+
+
+class TestBuildRequest:
+    """Tests for LLMClient._build_request."""
+
+    async def test_encodes_body_and_timeout(self) -> None:
+        async with httpx.AsyncClient(timeout=30) as client:
+            request = LLMClient._build_request(
+                client, make_config(), {"model": "m", "messages": []}, 5
+            )
+            default = LLMClient._build_request(client, make_config(), {})
+        assert request.url == "http://llm.test/v1/chat/completions"
+        assert request.headers["content-type"] == "application/json"
+        assert json.loads(request.content) == {"model": "m", "messages": []}
+        assert request.extensions["timeout"]["read"] == 5
+        assert default.extensions["timeout"]["read"] == 30
+
+
+class TestCallEmbeddings:
+    """Tests for LLMClient.call_embeddings."""
+
+    async def test_batches_and_preserves_order(self, mock_llm) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            inputs = json.loads(request.content)["input"]
+            data = [
+                {"index": i, "embedding": [float(len(text))]}
+                for i, text in enumerate(inputs)
+            ]
+            # Providers may return items out of order
+            return httpx.Response(200, json={"data": data[::-1]})
+
+        requests = mock_llm(handler)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        embeddings = await LLMClient.call_embeddings(make_config(), texts, batch_size=2)
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert sorted(len(r["input"]) for r in requests) == [1, 2, 2]
+        assert all("dimensions" not in r for r in requests)
+
+    async def test_single_input_requests_are_bounded(self, mock_llm) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            (text,) = json.loads(request.content)["input"]
+            return httpx.Response(
+                200, json={"data": [{"index": 0, "embedding": [float(len(text))]}]}
+            )
+
+        requests = mock_llm(handler)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        embeddings = await LLMClient.call_embeddings(
+            make_config(), texts, batch_size=1, max_concurrency=2
+        )
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert len(requests) == 5
+        assert peak == 2
+
+    async def test_sends_configured_dimensions(self, mock_llm) -> None:
+        requests = mock_llm(
+            lambda _: httpx.Response(
+                200, json={"data": [{"index": 0, "embedding": [1.0]}]}
+            )
+        )
+        await LLMClient.call_embeddings(make_config(dimensions=256), ["a"])
+        assert requests[0]["dimensions"] == 256
+
+    async def test_empty_inputs(self, mock_llm) -> None:
+        requests = mock_llm(lambda _: httpx.Response(500))
+        assert await LLMClient.call_embeddings(make_config(), []) == []
+        assert requests == []
+
+
+class TestCallTextBatch:
+    """Tests for LLMClient.call_text_batch."""
+
+    async def test_dedupes_prompts_and_isolates_failures(self, mock_llm) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            user = json.loads(request.content)["messages"][1]["content"]
+            if user == "bad":
+                return httpx.Response(500)
+            return httpx.Response(200, json=chat_completion(user.upper()))
+
+        requests = mock_llm(handler)
+        prompts = [("s", "a"), ("s", "bad"), ("s", "a"), ("s", "b")]
+        results = await LLMClient.call_text_batch(make_config(), prompts)
+        assert results == ["A", None, "A", "B"]
+        assert len(requests) == 3
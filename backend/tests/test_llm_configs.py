@@ -2,6 +2,10 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.services.common import LLMConfigManager
 
 
 @pytest.fixture
@@ -380,3 +384,90 @@ class TestLLMConfigDefaults:
         assert data["embedding"]["type"] == "embedding"
         assert data["chat"] is not None
         assert data["chat"]["type"] == "chat"
+
+
+class TestLLMConfigManagerCache:
+    """Tests for cached config lookups in LLMConfigManager."""
+
+    async def test_cached_lookup_skips_database(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """A repeated lookup returns a detached copy without querying."""
+        db_session.add(
+            LLMConfig(
+                id="llm_chat",
+                name="Chat",
+                type=LLMConfigType.CHAT,
+                model="gpt-4o-mini",
+                base_url="https://api.openai.com/v1",
+                api_key="sk-test",
+                is_default=True,
+                options={},
+            )
+        )
+        await db_session.commit()
+
+        first = await LLMConfigManager.get_chat_config(db_session)
+        assert first is not None
+        assert first.type == LLMConfigType.CHAT
+        assert first not in db_session
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("unexpected query")
+
+        monkeypatch.setattr(db_session, "execute", fail)
+        second = await LLMConfigManager.get_chat_config(db_session)
+        assert second is not first
+        assert second.id == "llm_chat"
+        assert second.api_key == "sk-test"
+
+    async def test_write_invalidates_cache(self, db_session: AsyncSession):
+        """Updating a config is visible to the next lookup."""
+        config = LLMConfig(
+            id="llm_chat",
+            name="Chat",
+            type=LLMConfigType.CHAT,
+            model="gpt-4o-mini",
+            base_url="https://api.openai.com/v1",
+            api_key="sk-test",
+            is_default=True,
+            options={},
+        )
+        db_session.add(config)
+        await db_session.commit()
+        await LLMConfigManager.get_chat_config(db_session)
+
+        config.model = "gpt-4o"
+        await db_session.commit()
+
+        refreshed = await LLMConfigManager.get_chat_config(db_session)
+        assert refreshed.model == "gpt-4o"
+
+    async def test_lookup_priority(self, db_session: AsyncSession):
+        """Requested config wins over the default, which wins over the rest."""
+        for config_id, is_default in [
+            ("llm_other", False),
+            ("llm_default", True),
+            ("llm_requested", False),
+        ]:
+            db_session.add(
+                LLMConfig(
+                    id=config_id,
+                    name=config_id,
+                    type=LLMConfigType.CHAT,
+                    model="gpt-4o-mini",
+                    base_url="https://api.openai.com/v1",
+                    api_key="sk-test",
+                    is_default=is_default,
+                    options={},
+                )
+            )
+        await db_session.commit()
+
+        requested = await LLMConfigManager.get_chat_config(db_session, "llm_requested")
+        missing = await LLMConfigManager.get_chat_config(db_session, "llm_missing")
+        default = await LLMConfigManager.get_chat_config(db_session)
+        assert requested.id == "llm_requested"
+        assert missing.id == "llm_default"
+        assert default.id == "llm_default"
+        assert await LLMConfigManager.get_embedding_config(db_session) is None
@@ -0,0 +1,192 @@
+"""Tests for the LLM matching strategy prompt building."""
+
+from collections.abc import Iterator
+
+import orjson
+import pytest
+
+from app.models.clue import Clue
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.models.prompt_template import PromptTemplate, TemplateType
+from app.services.common import LLMClient, LLMConfigManager, LLMResponse
+from app.services.matching import LLMStrategy
+from app.services.matching.models import MatchContext
+from app.services.matching.strategies import llm as llm_module
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache() -> Iterator[None]:
+    """Isolate the module-level prompt cache between tests."""
+    llm_module._MATCHING_PROMPTS.clear()
+    yield
+    llm_module._MATCHING_PROMPTS.clear()
+
+
+def make_clue(clue_id: str, keywords: list[str]) -> Clue:
+    """Build a transient clue shown to the matching LLM."""
+    return Clue(
+        id=clue_id,
+        npc_id="npc_1",
+        name=clue_id,
+        trigger_keywords=keywords,
+        trigger_semantic_summary=f"about {clue_id}",
+    )
+
+
+class TestBuildMatchingPrompt:
+    """Tests for LLMStrategy._build_llm_matching_prompt caching."""
+
+    async def test_reuses_prompt_for_same_clues(self, monkeypatch) -> None:
+        dumps_calls = 0
+        real_dumps = orjson.dumps
+
+        def counting_dumps(*args, **kwargs):
+            nonlocal dumps_calls
+            dumps_calls += 1
+            return real_dumps(*args, **kwargs)
+
+        monkeypatch.setattr(llm_module.orjson, "dumps", counting_dumps)
+        strategy = LLMStrategy(db=None)  # type: ignore[arg-type]
+        clues = [make_clue("c_knife", ["knife"]), make_clue("c_letter", ["letter"])]
+
+        first, first_segments = strategy._build_llm_matching_prompt(None, clues)
+        second, second_segments = strategy._build_llm_matching_prompt(
+            None, [make_clue("c_knife", ["knife"]), make_clue("c_letter", ["letter"])]
+        )
+
+        assert dumps_calls == 2
+        assert first == second
+        assert first_segments == second_segments
+        assert '"id":"c_knife"' in first
+
+    async def test_edited_clue_or_option_rebuilds(self) -> None:
+        strategy = LLMStrategy(db=None)  # type: ignore[arg-type]
+        base, _ = strategy._build_llm_matching_prompt(
+            None, [make_clue("c_knife", ["knife"])]
+        )
+        edited, _ = strategy._build_llm_matching_prompt(
+            None, [make_clue("c_knife", ["blade"])]
+        )
+        all_scores, _ = strategy._build_llm_matching_prompt(
+            None, [make_clue("c_knife", ["knife"])], return_all_scores=True
+        )
+
+        assert "blade" in edited and "blade" not in base
+        assert all_scores != base
+        assert len(llm_module._MATCHING_PROMPTS) == 3
+
+    async def test_renders_stored_template(self, db_session) -> None:
+        db_session.add(
+            PromptTemplate(
+                id="tmpl_match",
+                name="match",
+                type=TemplateType.CUSTOM,
+                content="Only match exact objects.",
+            )
+        )
+        await db_session.commit()
+
+        content = await LLMStrategy._get_template_content(db_session, "tmpl_match")
+        missing = await LLMStrategy._get_template_content(db_session, "tmpl_missing")
+        strategy = LLMStrategy(db=None)  # type: ignore[arg-type]
+        prompt, _ = strategy._build_llm_matching_prompt(
+            content, [make_clue("c_knife", ["knife"])]
+        )
+
+        assert missing is None
+        assert "Only match exact objects." in prompt
+
+    async def test_template_content_cached_until_written(self, db_session) -> None:
+        template = PromptTemplate(
+            id="tmpl_match",
+            name="match",
+            type=TemplateType.CUSTOM,
+            content="v1",
+        )
+        db_session.add(template)
+        await db_session.commit()
+
+        load = LLMStrategy._get_template_content
+        assert await load(db_session, "tmpl_match") == "v1"
+        # A hit never touches the session
+        assert await load(None, "tmpl_match") == "v1"  # type: ignore[arg-type]
+
+        template.content = "v2"
+        await db_session.commit()
+        assert await load(db_session, "tmpl_match") == "v2"
+
+
+class TestMatch:
+    """Tests for LLMStrategy.match result building."""
+
+    @pytest.fixture(autouse=True)
+    def fake_llm(self, monkeypatch) -> None:
+        async def fake_get_chat_config(db, config_id=None):
+            return LLMConfig(
+                id="llm_chat",
+                name="chat",
+                type=LLMConfigType.CHAT,
+                model="test-model",
+                base_url="http://llm.test/v1",
+                api_key="sk-test",
+                options={},
+            )
+
+        async def fake_call_structured_with_usage(
+            config, system_prompt, user_message, response_format, temperature
+        ):
+            return LLMResponse(
+                content=orjson.dumps(
+                    {
+                        "matches": [
+                            {"id": "c_letter", "score": 0.0, "reason": "no"},
+                            {"id": "c_ghost", "score": 0.9, "reason": "unknown"},
+                            {"id": "c_knife", "score": 0.8, "reason": "knife"},
+                        ]
+                    }
+                ).decode()
+            )
+
+        monkeypatch.setattr(
+            LLMConfigManager, "get_chat_config", staticmethod(fake_get_chat_config)
+        )
+        monkeypatch.setattr(
+            LLMClient, "call_structured_with_usage", fake_call_structured_with_usage
+        )
+
+    @staticmethod
+    def make_context(return_all_scores: bool) -> MatchContext:
+        return MatchContext(
+            player_message="the knife",
+            unlocked_clue_ids=set(),
+            npc_id="npc_1",
+            script_id="script_1",
+            llm_return_all_scores=return_all_scores,
+        )
+
+    async def test_keeps_positive_scores_for_known_clues(self) -> None:
+        strategy = LLMStrategy(db=None)  # type: ignore[arg-type]
+        clues = [make_clue("c_letter", ["letter"]), make_clue("c_knife", ["knife"])]
+
+        results, prompts = await strategy.match(clues, self.make_context(False))
+
+        assert [(r.clue.id, r.score) for r in results] == [("c_knife", 0.8)]
+        assert results[0].match_reasons == ["LLM: knife"]
+        assert prompts is not None
+
+    async def test_return_all_scores(self) -> None:
+        strategy = LLMStrategy(db=None)  # type: ignore[arg-type]
+        clues = [
+            make_clue("c_letter", ["letter"]),
+            make_clue("c_knife", ["knife"]),
+            make_clue("c_diary", ["diary"]),
+        ]
+
+        results, _ = await strategy.match(clues, self.make_context(True))
+
+        assert [(r.clue.id, r.score) for r in results] == [
+            ("c_letter", 0.0),
+            ("c_knife", 0.8),
+            ("c_diary", 0.0),
+        ]
+        assert results[2].match_reasons == ["LLM: 未匹配"]
@@ -0,0 +1,167 @@
+"""Tests for MatchingService helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect
+
+from app.models.clue import Clue
+from app.models.npc import NPC
+from app.models.script import Script
+from app.schemas.simulate import MatchingStrategy, SimulateRequest
+from app.services.matching import MatchingService
+from app.services.matching.models import MatchContext
+
+
+def make_clue(clue_id: str, prereqs: list[str] | None) -> Clue:
+    """Build a transient clue with the given prerequisites."""
+    return Clue(id=clue_id, npc_id="npc_1", name=clue_id, prereq_clue_ids=prereqs)
+
+
+class TestBuildContext:
+    """Tests for MatchingService._build_context."""
+
+    def test_normalizes_message_and_unlocked_ids(self) -> None:
+        request = SimulateRequest(
+            script_id="script_1",
+            npc_id="npc_1",
+            player_message="Where is the KNIFE?",
+            unlocked_clue_ids=["a", "b", "a"],
+            matching_strategy=MatchingStrategy.LLM,
+            template_id="tmpl_1",
+        )
+
+        context = MatchingService._build_context(request)
+
+        assert context.player_message == "where is the knife?"
+        assert context.unlocked_clue_ids == {"a", "b"}
+        assert context.matching_strategy == MatchingStrategy.LLM
+        assert context.template_id == "tmpl_1"
+
+
+class TestFilterByPrerequisites:
+    """Tests for MatchingService._filter_by_prerequisites."""
+
+    def test_splits_eligible_and_excluded(self) -> None:
+        service = MatchingService(db=None)  # type: ignore[arg-type]
+        context = MatchContext(
+            player_message="hello",
+            unlocked_clue_ids={"a", "b"},
+            npc_id="npc_1",
+            script_id="script_1",
+        )
+        clues = [
+            make_clue("c_none", None),
+            make_clue("c_empty", []),
+            make_clue("c_met", ["a", "b"]),
+            make_clue("c_partial", ["a", "x", "y"]),
+        ]
+
+        eligible, excluded = service._filter_by_prerequisites(clues, context)
+
+        assert [c.id for c in eligible] == ["c_none", "c_empty", "c_met"]
+        assert excluded == [
+            {
+                "clue_id": "c_partial",
+                "name": "c_partial",
+                "reason": "prerequisites_not_met",
+                "missing_prereq_ids": ["x", "y"],
+            }
+        ]
+
+
+class TestGetCandidateClues:
+    """Tests for MatchingService._get_candidate_clues."""
+
+    @pytest.mark.parametrize(
+        ("strategy", "detail_loaded"),
+        [(MatchingStrategy.KEYWORD, False), (MatchingStrategy.EMBEDDING, True)],
+    )
+    async def test_loads_only_matching_columns(
+        self, db_session, strategy, detail_loaded
+    ) -> None:
+        db_session.add(Script(id="script_1", title="Manor"))
+        db_session.add(NPC(id="npc_1", script_id="script_1", name="Butler"))
+        db_session.add(
+            Clue(
+                id="c_knife",
+                script_id="script_1",
+                npc_id="npc_1",
+                name="knife",
+                detail="a long description",
+                detail_for_npc="mention the knife",
+                trigger_keywords=["knife"],
+            )
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+
+        service = MatchingService(db_session)
+        clues = await service._get_candidate_clues("script_1", "npc_1", strategy)
+
+        assert [c.detail_for_npc for c in clues] == ["mention the knife"]
+        unloaded = inspect(clues[0]).unloaded
+        assert ("detail" not in unloaded) is detail_loaded
+        assert "created_at" in unloaded
+
+
+class TestNpcInputsPrefetch:
+    """Tests for cancelling the NPC reply prefetch with the request."""
+
+    @pytest.fixture
+    def service(self, monkeypatch) -> MatchingService:
+        # No engine needed: the patched loader never executes a statement
+        service = MatchingService(db=SimpleNamespace(bind=None))  # type: ignore[arg-type]
+        self.tasks: list[asyncio.Task] = []
+        real_prefetch = service._prefetch_npc_inputs
+
+        async def slow_load_inputs(context, db=None):
+            await asyncio.sleep(60)
+
+        def recording_prefetch(context):
+            task = real_prefetch(context)
+            self.tasks.append(task)
+            return task
+
+        async def no_clues(script_id, npc_id, strategy):
+            return []
+
+        monkeypatch.setattr(service._npc_generator, "load_inputs", slow_load_inputs)
+        monkeypatch.setattr(service, "_prefetch_npc_inputs", recording_prefetch)
+        monkeypatch.setattr(service, "_get_candidate_clues", no_clues)
+        return service
+
+    @staticmethod
+    def make_request() -> SimulateRequest:
+        return SimulateRequest(
+            script_id="script_1",
+            npc_id="npc_1",
+            player_message="hello",
+            npc_clue_template_id="tmpl_1",
+            npc_chat_config_id="llm_1",
+        )
+
+    async def test_cancelled_when_matching_fails(self, service, monkeypatch) -> None:
+        async def failing(**kwargs):
+            await asyncio.sleep(0)  # let the prefetch start
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(service, "_get_candidate_clues", failing)
+        with pytest.raises(RuntimeError):
+            await service.simulate(self.make_request())
+
+        (task,) = self.tasks
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
+
+    async def test_cancelled_when_stream_closes_early(self, service) -> None:
+        stream = service.simulate_stream(self.make_request())
+        event = await anext(stream)
+        assert event["event"] == "match_result"
+        await asyncio.sleep(0)  # let the prefetch start
+        await stream.aclose()
+
+        (task,) = self.tasks
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
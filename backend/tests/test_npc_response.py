@@ -0,0 +1,94 @@
+"""Tests for NPC response input loading."""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.log import DialogueLog
+from app.models.npc import NPC
+from app.models.prompt_template import PromptTemplate, TemplateType
+from app.models.script import Script
+from app.services.matching.npc_response import NpcResponseGenerator
+
+
+async def seed(db: AsyncSession) -> None:
+    """Persist one script, one NPC and a live and a deleted template."""
+    db.add(Script(id="script_1", title="Manor"))
+    db.add(NPC(id="npc_1", script_id="script_1", name="Butler"))
+    db.add(
+        PromptTemplate(
+            id="tpl_live",
+            name="live",
+            type=TemplateType.NPC_SYSTEM_PROMPT,
+            content="You are {{npc.name}}",
+        )
+    )
+    db.add(
+        PromptTemplate(
+            id="tpl_deleted",
+            name="deleted",
+            type=TemplateType.NPC_SYSTEM_PROMPT,
+            content="stale",
+            deleted_at=datetime.now(UTC),
+        )
+    )
+    await db.commit()
+
+
+class TestLoadNpcBundle:
+    """Tests for NpcResponseGenerator._load_npc_bundle."""
+
+    async def test_loads_npc_script_and_templates(self, db_session) -> None:
+        await seed(db_session)
+        npc, script, templates = await NpcResponseGenerator._load_npc_bundle(
+            db_session, "npc_1", "script_1", "tpl_live", "tpl_deleted"
+        )
+        assert npc.name == "Butler"
+        assert script.title == "Manor"
+        assert templates == {"tpl_live": "You are {{npc.name}}"}
+
+    async def test_missing_parts_are_left_out(self, db_session) -> None:
+        await seed(db_session)
+        npc, script, templates = await NpcResponseGenerator._load_npc_bundle(
+            db_session, "npc_1", "script_missing", None, "tpl_live"
+        )
+        assert npc.id == "npc_1"
+        assert script is None
+        assert templates == {"tpl_live": "You are {{npc.name}}"}
+
+    async def test_missing_npc(self, db_session) -> None:
+        await seed(db_session)
+        assert await NpcResponseGenerator._load_npc_bundle(
+            db_session, "npc_missing", "script_1", "tpl_live", None
+        ) == (None, None, {})
+
+
+class TestGetDialogueHistory:
+    """Tests for NpcResponseGenerator._get_dialogue_history."""
+
+    async def test_returns_latest_turns_oldest_first(self, db_session) -> None:
+        await seed(db_session)
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        for i in range(4):
+            db_session.add(
+                DialogueLog(
+                    session_id="sess_1",
+                    script_id="script_1",
+                    npc_id="npc_1",
+                    player_message=f"q{i}",
+                    npc_response=f"a{i}" if i != 2 else None,
+                    context={},
+                    matched_clues={},
+                    triggered_clues=[],
+                    debug_info={},
+                    created_at=start + timedelta(minutes=i),
+                )
+            )
+        await db_session.commit()
+
+        history = await NpcResponseGenerator._get_dialogue_history(
+            db_session, "sess_1", limit=3
+        )
+
+        assert history == [("q1", "a1"), ("q2", None), ("q3", "a3")]
+        assert await NpcResponseGenerator._get_dialogue_history(db_session, None) == []
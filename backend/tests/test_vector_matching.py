@@ -0,0 +1,180 @@
+"""Tests for vector clue retrievers."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from app.models.clue import Clue
+from app.models.llm_config import LLMConfig, LLMConfigType
+from app.services.common import LLMClient
+from app.services.vector_matching import (
+    _CLUE_EMBEDDINGS,
+    _CLUE_MATRICES,
+    _QUERY_EMBEDDINGS,
+    ChromaClueRetriever,
+    NumpyClueRetriever,
+    create_vector_retriever,
+)
+
+
+class FakeEmbeddings:
+    """Stands in for LLMClient.call_embeddings with fixed vectors."""
+
+    def __init__(self, vectors: dict[str, list[float]]) -> None:
+        self.vectors = vectors
+        self.calls: list[list[str]] = []
+
+    async def call_embeddings(
+        self, _config: LLMConfig, inputs: list[str]
+    ) -> list[list[float]]:
+        self.calls.append(inputs)
+        return [self.vectors[text] for text in inputs]
+
+
+@pytest.fixture(autouse=True)
+def clear_embedding_caches() -> Iterator[None]:
+    """Isolate the module-level embedding caches between tests."""
+    _QUERY_EMBEDDINGS.clear()
+    _CLUE_EMBEDDINGS.clear()
+    _CLUE_MATRICES.clear()
+    yield
+    _QUERY_EMBEDDINGS.clear()
+    _CLUE_EMBEDDINGS.clear()
+    _CLUE_MATRICES.clear()
+
+
+def make_embedding_config() -> LLMConfig:
+    """Build a transient embedding config (never persisted)."""
+    return LLMConfig(
+        id="llm_embed",
+        name="embed",
+        type=LLMConfigType.EMBEDDING,
+        model="test-embedding",
+        base_url="http://llm.test/v1",
+        api_key="sk-test",
+        options={},
+    )
+
+
+def make_clue(clue_id: str, summary: str) -> Clue:
+    """Build a transient clue whose embedding text is ``summary``."""
+    return Clue(
+        id=clue_id,
+        npc_id="npc_1",
+        name=clue_id,
+        trigger_semantic_summary=summary,
+    )
+
+
+@pytest.mark.usefixtures("embedder")
+class TestNumpyClueRetriever:
+    """Tests for the in-process numpy retriever."""
+
+    @pytest.fixture
+    def embedder(self, monkeypatch) -> FakeEmbeddings:
+        embedder = FakeEmbeddings(
+            {
+                "knife": [1.0, 0.0],
+                "letter": [0.0, 2.0],
+                "diary": [0.6, 0.8],
+                "zero": [0.0, 0.0],
+                "query": [3.0, 0.0],
+            }
+        )
+        monkeypatch.setattr(LLMClient, "call_embeddings", embedder.call_embeddings)
+        return embedder
+
+    @pytest.fixture
+    def retriever(self) -> NumpyClueRetriever:
+        return NumpyClueRetriever(make_embedding_config())
+
+    async def test_ranks_by_similarity(self, retriever, embedder) -> None:
+        clues = [
+            make_clue("c_letter", "letter"),
+            make_clue("c_knife", "knife"),
+            make_clue("c_diary", "diary"),
+            make_clue("c_zero", "zero"),
+        ]
+        await retriever.build_embedding_db(clues)
+        results = await retriever.retrieve_clues("query", k=3)
+
+        # The orthogonal and zero-norm clues tie for third place
+        assert [r.clue_id for r in results][:2] == ["c_knife", "c_diary"]
+        assert results[2].clue_id in {"c_letter", "c_zero"}
+        assert results[2].score == pytest.approx(1 / 3)
+        # Same scale as Chroma: 1 / (1 + squared L2 distance) of unit vectors
+        assert results[0].score == pytest.approx(1.0)
+        assert results[1].score == pytest.approx(1 / (3 - 2 * 0.6))
+        assert results[0].content == "knife"
+        assert results[0].npc_id == "npc_1"
+        assert embedder.calls == [["letter", "knife", "diary", "zero"], ["query"]]
+
+    async def test_threshold_and_cleanup(self, retriever) -> None:
+        await retriever.build_embedding_db(
+            [make_clue("c_knife", "knife"), make_clue("c_letter", "letter")]
+        )
+        results = await retriever.retrieve_clues("query", k=5, score_threshold=0.5)
+        assert [r.clue_id for r in results] == ["c_knife"]
+
+        await retriever.cleanup()
+        assert await retriever.retrieve_clues("query") == []
+        assert retriever.get_clue("c_knife") is None
+
+    async def test_repeated_query_reuses_embedding(self, retriever, embedder) -> None:
+        await retriever.build_embedding_db([make_clue("c_knife", "knife")])
+        first = await retriever.retrieve_clues("query")
+        second = await retriever.retrieve_clues("query")
+        assert first == second
+        assert embedder.calls == [["knife"], ["query"]]
+
+    async def test_only_new_clue_content_is_embedded(self, retriever, embedder) -> None:
+        await retriever.build_embedding_db(
+            [make_clue("c_knife", "knife"), make_clue("c_letter", "letter")]
+        )
+        await retriever.cleanup()
+        await retriever.build_embedding_db(
+            [
+                make_clue("c_knife", "knife"),
+                make_clue("c_diary", "diary"),
+                make_clue("c_copy", "diary"),
+            ]
+        )
+        results = await retriever.retrieve_clues("query", k=1)
+
+        assert embedder.calls == [["knife", "letter"], ["diary"], ["query"]]
+        assert [r.clue_id for r in results] == ["c_knife"]
+
+    async def test_query_rides_along_with_clue_batch(self, retriever, embedder) -> None:
+        await retriever.build_embedding_db(
+            [make_clue("c_knife", "knife"), make_clue("c_letter", "letter")],
+            query="query",
+        )
+        results = await retriever.retrieve_clues("query", k=1)
+
+        assert [r.clue_id for r in results] == ["c_knife"]
+        assert embedder.calls == [["knife", "letter", "query"]]
+
+    async def test_same_clue_set_reuses_matrix(self, embedder) -> None:
+        clues = [make_clue("c_knife", "knife"), make_clue("c_letter", "letter")]
+        first = NumpyClueRetriever(make_embedding_config())
+        await first.build_embedding_db(clues)
+        matrix = first._matrix
+        await first.cleanup()
+
+        second = NumpyClueRetriever(make_embedding_config())
+        await second.build_embedding_db(clues)
+        results = await second.retrieve_clues("query", k=1)
+
+        assert second._matrix is matrix
+        assert not matrix.flags.writeable
+        assert [r.clue_id for r in results] == ["c_knife"]
+        assert second.get_clue("c_letter") is clues[1]
+        assert embedder.calls == [["knife", "letter"], ["query"]]
+
+
+def test_factory_defaults_to_numpy() -> None:
+    config = make_embedding_config()
+    assert isinstance(create_vector_retriever(config), NumpyClueRetriever)
+    assert isinstance(
+        create_vector_retriever(config, backend="chroma"), ChromaClueRetriever
+    )